@@ -0,0 +1,53 @@
+# agenda.py
+import heapq
+
+# ==========================================
+# AGENDA DE MOVIMENTOS (Fila de Prioridade)
+# ==========================================
+
+class AgendaMovimentos:
+    """
+    Agentes ordenados pela hora do próximo movimento (heapq). A cada frame só
+    os agentes vencidos saem da fila, então o custo acompanha quem se move, não
+    o total de agentes. A remoção é preguiçosa: a entrada antiga fica na fila e
+    é descartada quando sai.
+    """
+    def __init__(self):
+        self._fila = []
+        self._ordem = {} # agente -> ordem de chegada (desempate; igual à ordem de agentes_ativos)
+        self._contador = 0
+
+    def adicionar(self, agente):
+        self._ordem[agente] = self._contador
+        self._contador += 1
+        self.agendar(agente)
+
+    def agendar(self, agente, tempo=None):
+        """Recoloca o agente na fila para `tempo` (padrão: tempo_proximo_movimento)."""
+        ordem = self._ordem.get(agente)
+        if ordem is None:
+            return # Removido enquanto era processado (ex.: morreu)
+        if tempo is None:
+            tempo = agente.tempo_proximo_movimento
+        heapq.heappush(self._fila, (tempo, ordem, agente))
+
+    def remover(self, agente):
+        self._ordem.pop(agente, None)
+
+    def limpar(self):
+        self._fila.clear()
+        self._ordem.clear()
+
+    def vencidos(self, tempo):
+        """Retira da fila os agentes com hora <= tempo, na ordem em que foram adicionados."""
+        fila = self._fila
+        saida = []
+        while fila and fila[0][0] <= tempo:
+            _, ordem, agente = heapq.heappop(fila)
+            if self._ordem.get(agente) == ordem:
+                saida.append((ordem, agente))
+        saida.sort(key=lambda item: item[0])
+        return [agente for _, agente in saida]
+
+    def __len__(self):
+        return len(self._ordem)
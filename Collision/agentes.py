@@ -1,5 +1,9 @@
 # agentes.py
-import pygame
+# pygame só é necessário para desenhar: a simulação (simulacao.py) roda sem ele
+try:
+    import pygame
+except ImportError:
+    pygame = None
 import random
 from abc import ABC, abstractmethod
 from config import CONFIG
@@ -28,22 +32,29 @@ class Agente:
         pygame.draw.circle(tela, self.cor, centro, int(rect.width * 0.4))
 
     def mover_para(self, nova_pos):
+        pos_anterior = self.pos
         self.pos = nova_pos
-        self.notify("moveu", nova_pos)
+        self.notify("moveu", (self, pos_anterior, nova_pos))
 
     def receber_dano(self, quantidade):
         self.vida -= quantidade
-        self.notify("morreu" if self.vida <= 0 else "dano")
+        self.notify("morreu" if self.vida <= 0 else "dano", self)
 
 # ==========================================
 # AGENTE IA (COM ESTRATÉGIA DE EVASÃO E TEMPO)
 # ==========================================
 
 class AgenteIA(Agente):
-    def __init__(self, pos_inicial, pos_final, caminho, cor):
+    def __init__(self, pos_inicial, pos_final, caminho, cor, cooperativo=False, rng=None):
         super().__init__(pos_inicial, cor)
+        # Sorteios do agente (tempo e evasão); a simulação passa um random.Random com semente
+        self.rng = rng if rng is not None else random
         self.pos_final = pos_final
         self.caminho_planejado = caminho
+        # Cooperativo: caminho_planejado tem uma célula por tick, reservada no grid
+        # até a janela acabar; no tick_replanejar a rota e as reservas são renovadas
+        self.cooperativo = cooperativo
+        self.tick_replanejar = 0
         
         # Estado de Intenção
         self.intenção_atual = pos_inicial 
@@ -55,7 +66,7 @@ class AgenteIA(Agente):
 
     def sortear_tempo_movimento(self):
         """Sorteia se o próximo passo demora 250ms ou 500ms."""
-        self.delay_atual = random.choice([250, 500])
+        self.delay_atual = self.rng.choice([250, 500])
     
     def verificar_tempo(self, tempo_jogo):
         """Retorna True se chegou a hora de se mover."""
@@ -64,14 +75,33 @@ class AgenteIA(Agente):
         return False
 
     def agendar_proximo_movimento(self, tempo_jogo):
+        if self.cooperativo:
+            # Passos presos aos ticks da tabela de reservas (sem sorteio)
+            self.delay_atual = CONFIG["DURACAO_TICK"]
+            self.tempo_proximo_movimento = (tempo_jogo // self.delay_atual + 1) * self.delay_atual
+            return
         self.sortear_tempo_movimento()
         self.tempo_proximo_movimento = tempo_jogo + self.delay_atual
 
-    def planejar_movimento(self, grid_singleton, lista_agentes_ativos):
+    def definir_intencao(self, pos):
+        """Muda a célula reservada; os observers (o grid) atualizam a lista de intenção."""
+        if pos != self.intenção_atual:
+            anterior = self.intenção_atual
+            self.intenção_atual = pos
+            self.notify("intencao", (self, anterior, pos))
+
+    def planejar_movimento(self, grid_singleton):
         """
         Retorna (dx, dy) para o movimento ou (0,0) se esperar/bloqueado.
         Realiza evasão de 2 células se houver conflito de intenção OU Físico.
         """
+        if self.cooperativo:
+            # Janela deslizante: replaneja a partir da célula atual (ocupada desde o
+            # tick anterior) antes que as reservas acabem, ou depois de ficar sem rota
+            tick = self.tempo_proximo_movimento // CONFIG["DURACAO_TICK"]
+            if tick >= self.tick_replanejar:
+                grid_singleton.planejar_cooperativo(self, tick - 1)
+
         # Se já chegou ou não tem caminho
         if not self.caminho_planejado or self.pos == self.pos_final:
             return None
@@ -82,18 +112,14 @@ class AgenteIA(Agente):
         # 1. VERIFICAÇÃO FÍSICA (Ocupação Atual)
         # ============================================================
         
-        # Verifica se JÁ TEM um agente lá (Colisão Física)
-        ocupado_fisicamente = False
-        for outro_agente in lista_agentes_ativos:
-            if outro_agente != self and outro_agente.pos == proximo_passo:
-                ocupado_fisicamente = True
-                break
+        # Verifica se JÁ TEM um agente lá (Colisão Física) no mapa de ocupação do grid
+        outro_agente = grid_singleton.ocupacao.get(proximo_passo)
+        ocupado_fisicamente = outro_agente is not None and outro_agente != self
         
         if ocupado_fisicamente:
             print(f"Agente {self.pos} detectou OBSTÁCULO FÍSICO em {proximo_passo}! Iniciando Evasão...")
             # MUDANÇA AQUI: Em vez de esperar, executa a evasão longa (mesma lógica da intenção)
-            self.executar_evasao_longa(grid_singleton)
-            self.intenção_atual = self.pos
+            self.resolver_conflito(grid_singleton)
             return (0, 0)
 
         # ============================================================
@@ -105,8 +131,7 @@ class AgenteIA(Agente):
             grid_singleton.lista_intencao[proximo_passo] != self):
             
             print(f"Agente {self.pos} detectou CONFLITO DE INTENÇÃO em {proximo_passo}! Iniciando Evasão...")
-            self.executar_evasao_longa(grid_singleton)
-            self.intenção_atual = self.pos
+            self.resolver_conflito(grid_singleton)
             return (0, 0)
 
         # ============================================================
@@ -117,9 +142,19 @@ class AgenteIA(Agente):
         dy = proximo_passo[1] - self.pos[1]
         
         self.caminho_planejado.pop(0) # Consome o passo
-        self.intenção_atual = proximo_passo # Atualiza intenção
+        self.definir_intencao(proximo_passo) # Atualiza intenção
         return (dx, dy)
 
+    def resolver_conflito(self, grid_singleton):
+        """Fica parado neste tick e refaz a rota (evasão longa, ou replanejamento com reservas)."""
+        if self.cooperativo:
+            # O passo de agora é o tick em que o movimento estava agendado
+            tick = self.tempo_proximo_movimento // CONFIG["DURACAO_TICK"]
+            grid_singleton.planejar_cooperativo(self, tick)
+        else:
+            self.executar_evasao_longa(grid_singleton)
+        self.definir_intencao(self.pos)
+
     def executar_evasao_longa(self, grid_singleton):
         """
         Tenta encontrar um ponto a 2 células de distância em direção aleatória
@@ -127,7 +162,7 @@ class AgenteIA(Agente):
         """
         # Direções possíveis (cardeais)
         direcoes = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-        random.shuffle(direcoes)
+        self.rng.shuffle(direcoes)
         
         ponto_evasao = None
         
@@ -151,10 +186,9 @@ class AgenteIA(Agente):
                 self.pos, ponto_evasao, grid_singleton.obstaculos.keys(), grid_singleton.resolucao
             )
             
-            # 2. Rota do ponto de evasão até o final
-            rota_final = grid_singleton.pathfinder_ia.encontrar_caminho(
-                ponto_evasao, self.pos_final, grid_singleton.obstaculos.keys(), grid_singleton.resolucao
-            )
+            # 2. Rota do ponto de evasão até o final: segue o campo de fluxo do destino,
+            # compartilhado com os outros agentes que vão para o mesmo ponto
+            rota_final = grid_singleton.caminho_pelo_campo(ponto_evasao, self.pos_final)
             
             # Concatena as rotas
             if rota_evasao and rota_final:
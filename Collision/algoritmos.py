@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
-from collections import deque
+from array import array
+from collections import OrderedDict, deque
+import heapq
 from config import CONFIG # Precisa do GRID_RESOLUCAO
 
 # ==========================================
@@ -11,29 +13,801 @@ class IPathfinder(ABC):
     def encontrar_caminho(self, inicio, fim, obstaculos_set, resolucao):
         pass
 
+# ==========================================
+# Núcleo de busca com ids inteiros
+# ==========================================
+# As células viram ids (id = lin * resolucao + col) e os dados da busca ficam em
+# buffers pré-alocados, reaproveitados entre chamadas. `visitado` guarda a geração
+# da busca que marcou a célula, então não precisa ser zerado a cada busca.
+
+class NucleoIds:
+    def __init__(self, resolucao):
+        n = resolucao * resolucao
+        self.resolucao = resolucao
+        self.pai = array('i', bytes(4 * n))
+        self.custo = array('i', bytes(4 * n))
+        self.visitado = array('I', bytes(4 * n))
+        self.fechado = array('I', bytes(4 * n))
+        self.fila = array('i', bytes(4 * n)) # Cada célula entra no máximo uma vez na BFS
+        self.bloqueado = bytearray(n)
+        self._obstaculos_carregados = frozenset() # Conteúdo atual de bloqueado
+        self.versao_bloqueado = 0 # Muda a cada recarga (chave das tabelas derivadas de bloqueado)
+        self.geracao = 0
+        self.expandidos = 0 # Células expandidas pelo último A*
+
+    def carregar_obstaculos(self, obstaculos_set):
+        """
+        Preenche self.bloqueado e o devolve. O conteúdo carregado fica guardado
+        (frozenset): com os mesmos obstáculos a grade não é tocada, e com outros
+        só as células que entraram ou saíram são trocadas.
+        """
+        carregados = self._obstaculos_carregados
+        if len(carregados) == len(obstaculos_set) and carregados == obstaculos_set:
+            return self.bloqueado
+        novos = frozenset(obstaculos_set)
+        self._obstaculos_carregados = novos
+        self.versao_bloqueado += 1
+
+        R = self.resolucao
+        bloqueado = self.bloqueado
+        for lin, col in carregados - novos:
+            bloqueado[lin * R + col] = 0
+        for lin, col in novos - carregados:
+            bloqueado[lin * R + col] = 1
+        return bloqueado
+
+    def nova_geracao(self):
+        self.geracao += 1
+        if self.geracao == 0xFFFFFFFF: # Estouro do contador: zera as marcas
+            self.visitado = array('I', bytes(len(self.visitado) * 4))
+            self.fechado = array('I', bytes(len(self.fechado) * 4))
+            self.geracao = 1
+        return self.geracao
+
+    def bfs(self, origem, destino, primeiro, vizinhos):
+        """BFS de origem até destino; os predecessores ficam em self.pai. Retorna True se achou."""
+        pai, visitado, fila, bloqueado = self.pai, self.visitado, self.fila, self.bloqueado
+        g = self.nova_geracao()
+        visitado[origem] = g
+        pai[origem] = origem
+        fila[0] = origem
+        cabeca, cauda = 0, 1
+        while cabeca < cauda:
+            atual = fila[cabeca]
+            cabeca += 1
+            if atual == destino:
+                return True
+            for k in range(primeiro[atual], primeiro[atual + 1]):
+                vizinho = vizinhos[k]
+                if visitado[vizinho] != g and not bloqueado[vizinho]:
+                    visitado[vizinho] = g
+                    pai[vizinho] = atual
+                    fila[cauda] = vizinho
+                    cauda += 1
+        return False
+
+    def astar(self, origem, destino, primeiro, vizinhos, h):
+        """
+        A* com heapq sobre ids; h(id) é a heurística até o destino. Retorna True
+        se achou; o número de células expandidas fica em self.expandidos.
+        """
+        pai, custo, visitado, fechado, bloqueado = self.pai, self.custo, self.visitado, self.fechado, self.bloqueado
+        g = self.nova_geracao()
+        visitado[origem] = g
+        custo[origem] = 0
+        pai[origem] = origem
+
+        # Itens da fila: (f, h, contador, id). Empate em f favorece quem está
+        # mais perto do fim; o contador mantém a ordem de inserção nos empates.
+        contador = 0
+        fila = [(h(origem), 0, contador, origem)]
+        self.expandidos = 0
+        while fila:
+            _, _, _, atual = heapq.heappop(fila)
+            if fechado[atual] == g:
+                continue # Entrada antiga, a célula já saiu com custo menor
+            fechado[atual] = g
+            self.expandidos += 1
+            if atual == destino:
+                return True
+
+            novo_custo = custo[atual] + 1
+            for k in range(primeiro[atual], primeiro[atual + 1]):
+                vizinho = vizinhos[k]
+                if bloqueado[vizinho] or fechado[vizinho] == g:
+                    continue
+                if visitado[vizinho] != g or novo_custo < custo[vizinho]:
+                    visitado[vizinho] = g
+                    custo[vizinho] = novo_custo
+                    pai[vizinho] = atual
+                    h_vizinho = h(vizinho)
+                    contador += 1
+                    heapq.heappush(fila, (novo_custo + h_vizinho, h_vizinho, contador, vizinho))
+        return False
+
+    def dijkstra(self, origem, destino, primeiro, vizinhos, custos, h=None):
+        """
+        Menor custo sobre terreno ponderado: entrar em id custa custos[id]
+        (0 = intransponível). Com h(id) admissível vira A*. Retorna True se achou;
+        o custo do caminho fica em self.custo[destino].
+        """
+        pai, custo, visitado, fechado = self.pai, self.custo, self.visitado, self.fechado
+        g = self.nova_geracao()
+        visitado[origem] = g
+        custo[origem] = 0
+        pai[origem] = origem
+
+        contador = 0
+        fila = [(h(origem) if h else 0, contador, origem)]
+        self.expandidos = 0
+        while fila:
+            _, _, atual = heapq.heappop(fila)
+            if fechado[atual] == g:
+                continue
+            fechado[atual] = g
+            self.expandidos += 1
+            if atual == destino:
+                return True
+
+            custo_atual = custo[atual]
+            for k in range(primeiro[atual], primeiro[atual + 1]):
+                vizinho = vizinhos[k]
+                passo = custos[vizinho]
+                if not passo or fechado[vizinho] == g:
+                    continue
+                novo_custo = custo_atual + passo
+                if visitado[vizinho] != g or novo_custo < custo[vizinho]:
+                    visitado[vizinho] = g
+                    custo[vizinho] = novo_custo
+                    pai[vizinho] = atual
+                    contador += 1
+                    heapq.heappush(fila, (novo_custo + (h(vizinho) if h else 0), contador, vizinho))
+        return False
+
+    def caminho(self, destino):
+        """Converte a cadeia de predecessores de volta para tuplas (lin, col)."""
+        pai = self.pai
+        ids = [destino]
+        while pai[ids[-1]] != ids[-1]:
+            ids.append(pai[ids[-1]])
+        return [divmod(i, self.resolucao) for i in reversed(ids)]
+
+
+_nucleos = {} # resolucao -> NucleoIds
+
+def obter_nucleo(resolucao):
+    if resolucao not in _nucleos:
+        _nucleos[resolucao] = NucleoIds(resolucao)
+    return _nucleos[resolucao]
+
 class BFSAlgoritmo(IPathfinder):
-    """Implementação do BFS que usa o Adapter da GridSystem para obter vizinhos."""
+    """Implementação do BFS que usa a tabela de vizinhos do Adapter (via GridSystem)."""
     def encontrar_caminho(self, inicio, fim, obstaculos_set, resolucao):
 
         from grid_system import GridSystem # Para obter a vizinhança
         # Obtém a instância única do GridSystem
         grid_singleton = GridSystem.getInstance() 
 
-        filas = deque([(inicio, [inicio])])
-        visitados = {inicio}
-        
-        while filas:
-            atual, caminho = filas.popleft()
+        # Vizinhança pré-calculada pelo Adapter: células viram ids inteiros
+        primeiro, vizinhos = grid_singleton.tabela_vizinhos()
+        nucleo = obter_nucleo(resolucao)
+        nucleo.carregar_obstaculos(obstaculos_set)
+        destino = fim[0] * resolucao + fim[1]
+        if nucleo.bfs(inicio[0] * resolucao + inicio[1], destino, primeiro, vizinhos):
+            return nucleo.caminho(destino)
+        return None
+
+class AStarAlgoritmo(IPathfinder):
+    """
+    A* com fila de prioridade (heapq). A heurística padrão é a distância da
+    geometria atual (Manhattan no Retangular, distância hexagonal no Hexagonal),
+    obtida do Adapter através do Singleton. Outra heurística pode ser passada
+    como função h(celula, fim).
+    """
+    def __init__(self, heuristica=None):
+        self.heuristica = heuristica
+        self.nos_expandidos = 0 # Células retiradas da fila na última busca
+
+    def encontrar_caminho(self, inicio, fim, obstaculos_set, resolucao):
+
+        from grid_system import GridSystem
+        grid_singleton = GridSystem.getInstance()
+        distancia = self.heuristica or grid_singleton.distancia
+
+        primeiro, vizinhos = grid_singleton.tabela_vizinhos()
+        nucleo = obter_nucleo(resolucao)
+        nucleo.carregar_obstaculos(obstaculos_set)
+        destino = fim[0] * resolucao + fim[1]
+        achou = nucleo.astar(inicio[0] * resolucao + inicio[1], destino, primeiro, vizinhos,
+                             lambda i: distancia(divmod(i, resolucao), fim))
+        self.nos_expandidos = nucleo.expandidos
+        return nucleo.caminho(destino) if achou else None
+
+class DijkstraAlgoritmo(IPathfinder):
+    """
+    Caminho de menor custo no terreno ponderado. O custo de cada célula vem de
+    GridSystem.grade_custos() (get_custo das entidades, empacotado num array),
+    então obstaculos_set não é consultado: paredes têm custo 0 (intransponível) e
+    entidades mais caras, como o fogo no Collision, são evitadas quando há desvio
+    que compense. Com a heurística da geometria (padrão) a busca é um A*.
+    """
+    def __init__(self, usar_heuristica=True):
+        self.usar_heuristica = usar_heuristica
+        self.nos_expandidos = 0
+        self.custo_total = None # Custo do último caminho encontrado
+
+    def encontrar_caminho(self, inicio, fim, obstaculos_set, resolucao):
+
+        from grid_system import GridSystem
+        grid_singleton = GridSystem.getInstance()
+
+        primeiro, vizinhos = grid_singleton.tabela_vizinhos()
+        nucleo = obter_nucleo(resolucao)
+        h = None
+        if self.usar_heuristica: # Admissível: o menor custo de uma célula é 1
+            h = lambda i: grid_singleton.distancia(divmod(i, resolucao), fim)
+        destino = fim[0] * resolucao + fim[1]
+        achou = nucleo.dijkstra(inicio[0] * resolucao + inicio[1], destino, primeiro, vizinhos,
+                                grid_singleton.grade_custos(), h)
+        self.nos_expandidos = nucleo.expandidos
+        self.custo_total = nucleo.custo[destino] if achou else None
+        return nucleo.caminho(destino) if achou else None
+
+_BITS = bytes.maketrans(b'\x00\x01', b'01') # bytearray de 0/1 -> texto binário
+
+class JPSAlgoritmo(IPathfinder):
+    """
+    Jump Point Search para grids retangulares de 4 direções (custo uniforme).
+    Movimentos verticais fazem o papel da diagonal do JPS clássico: a cada passo
+    vertical a busca olha a linha para os dois lados. Movimentos horizontais só
+    param no fim ou em vizinhos forçados (célula acima/abaixo livre com a célula
+    anterior dela bloqueada). Só os pontos de salto entram na fila do A*.
+    Os saltos horizontais saem de máscaras de bits por linha (paredes e vizinhos
+    forçados), então cada passo vertical custa O(1) em vez de O(R).
+    """
+    def __init__(self):
+        self.nos_expandidos = 0 # Pontos de salto retirados da fila na última busca
+        self._chave_mascaras = None
+        self._mascaras = None
+
+    def _mascaras_linhas(self, nucleo):
+        """
+        Uma máscara de bits por linha (bit col = célula bloqueada) e, para cada
+        sentido dc (1 ou -1), a máscara dos vizinhos forçados de cada linha.
+        Refeitas quando nucleo.bloqueado é recarregado.
+        """
+        chave = (nucleo, nucleo.versao_bloqueado)
+        if self._chave_mascaras == chave:
+            return self._mascaras
+        R, bloqueado = nucleo.resolucao, nucleo.bloqueado
+        todos = (1 << R) - 1
+        paredes = [int(bytes(bloqueado[lin * R:(lin + 1) * R])[::-1].translate(_BITS), 2) for lin in range(R)]
+
+        forcados = {}
+        for dc in (1, -1):
+            # Célula de trás (col - dc) bloqueada; fora do grid conta como bloqueada
+            atras = [((m << 1) | 1) & todos if dc == 1 else (m >> 1) | (1 << (R - 1)) for m in paredes]
+            linhas = []
+            for lin in range(R):
+                mascara = 0
+                for v in (lin - 1, lin + 1):
+                    if 0 <= v < R:
+                        mascara |= ~paredes[v] & atras[v]
+                linhas.append(mascara & ~paredes[lin])
+            forcados[dc] = linhas
+        self._chave_mascaras, self._mascaras = chave, (paredes, forcados)
+        return self._mascaras
+
+    def encontrar_caminho(self, inicio, fim, obstaculos_set, resolucao):
+
+        from grid_system import GridSystem
+        grid_singleton = GridSystem.getInstance()
+        if grid_singleton.geometria != "RETANGULAR":
+            # JPS só vale para a vizinhança de 4 direções; no Hexagonal usa o A*
+            return AStarAlgoritmo().encontrar_caminho(inicio, fim, obstaculos_set, resolucao)
+
+        nucleo = obter_nucleo(resolucao)
+        bloqueado = nucleo.carregar_obstaculos(obstaculos_set)
+
+        def livre(lin, col):
+            return 0 <= lin < resolucao and 0 <= col < resolucao and not bloqueado[lin * resolucao + col]
+
+        def forcado(lin, col, dc):
+            # Vizinhos verticais que só são alcançados de forma ótima virando aqui
+            return [dl for dl in (-1, 1) if livre(lin + dl, col) and not livre(lin + dl, col - dc)]
+
+        paredes, forcados = self._mascaras_linhas(nucleo)
+
+        def saltar_horizontal(lin, col, dc):
+            # Primeira parede (limite) e primeiro vizinho forçado (alvo) à frente de col
+            parede, forcado_linha = paredes[lin], forcados[dc][lin]
+            if dc == 1:
+                frente = parede >> (col + 1)
+                limite = col + (frente & -frente).bit_length() if frente else resolucao
+                frente = forcado_linha >> (col + 1)
+                alvo = col + (frente & -frente).bit_length() if frente else resolucao
+            else:
+                antes = (1 << col) - 1
+                limite = (parede & antes).bit_length() - 1
+                alvo = (forcado_linha & antes).bit_length() - 1
+            if lin == fim[0] and 0 < (fim[1] - col) * dc < (limite - col) * dc and (fim[1] - alvo) * dc <= 0:
+                return fim # O fim vem antes da parede e do vizinho forçado
+            return (lin, alvo) if (alvo - limite) * dc < 0 else None
+
+        def saltar_vertical(lin, col, dl):
+            while True:
+                lin += dl
+                if not livre(lin, col):
+                    return None
+                if ((lin, col) == fim or saltar_horizontal(lin, col, 1)
+                        or saltar_horizontal(lin, col, -1)):
+                    return (lin, col)
+
+        def h(celula):
+            return abs(celula[0] - fim[0]) + abs(celula[1] - fim[1])
+
+        # Itens da fila: (f, h, contador, célula, direção de chegada)
+        contador = 0
+        fila = [(h(inicio), 0, contador, inicio, None)]
+        custo = {inicio: 0}
+        pai = {inicio: None}
+        fechados = set()
+        self.nos_expandidos = 0
+
+        while fila:
+            _, _, _, atual, direcao = heapq.heappop(fila)
+            if atual in fechados:
+                continue
+            fechados.add(atual)
+            self.nos_expandidos += 1
+
             if atual == fim:
-                return caminho
-            
+                return self._expandir_caminho(atual, pai)
+
             lin, col = atual
-            
-            # CHAMA O ADAPTER através do Singleton
-            vizinhos = grid_singleton.obter_vizinhos(lin, col) 
-            
-            for vizinho in vizinhos:
-                if vizinho not in visitados and vizinho not in obstaculos_set:
-                    visitados.add(vizinho)
-                    filas.append((vizinho, caminho + [vizinho]))
-        return None
\ No newline at end of file
+            if direcao is None: # Início: todas as direções
+                direcoes = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+            elif direcao[0] != 0: # Chegou na vertical: segue e abre a linha
+                direcoes = [direcao, (0, 1), (0, -1)]
+            else: # Chegou na horizontal: segue e vira só para os vizinhos forçados
+                direcoes = [direcao] + [(dl, 0) for dl in forcado(lin, col, direcao[1])]
+
+            for dl, dc in direcoes:
+                if dl:
+                    ponto = saltar_vertical(lin, col, dl)
+                else:
+                    ponto = saltar_horizontal(lin, col, dc)
+                if ponto is None or ponto in fechados:
+                    continue
+                novo_custo = custo[atual] + abs(ponto[0] - lin) + abs(ponto[1] - col)
+                if novo_custo < custo.get(ponto, novo_custo + 1):
+                    custo[ponto] = novo_custo
+                    pai[ponto] = atual
+                    h_ponto = h(ponto)
+                    contador += 1
+                    heapq.heappush(fila, (novo_custo + h_ponto, h_ponto, contador, ponto, (dl, dc)))
+        return None
+
+    @staticmethod
+    def _expandir_caminho(atual, pai):
+        # Pontos de salto consecutivos estão na mesma linha ou coluna:
+        # preenche as células entre eles
+        caminho = [atual]
+        while pai[atual] is not None:
+            anterior = pai[atual]
+            dl = (anterior[0] > atual[0]) - (anterior[0] < atual[0])
+            dc = (anterior[1] > atual[1]) - (anterior[1] < atual[1])
+            while atual != anterior:
+                atual = (atual[0] + dl, atual[1] + dc)
+                caminho.append(atual)
+        return caminho[::-1]
+
+
+class CacheCaminhos(IPathfinder):
+    """
+    Proxy com cache LRU na frente de outra estratégia. A chave é
+    (versão do layout, início, fim): os obstáculos passados devem ser os do
+    GridSystem, que incrementa versao_layout a cada alteração. Os contadores
+    da última busca (nos_expandidos, custo_total) são guardados com cada
+    entrada; num acerto nenhum nó é expandido.
+    """
+    ESTATISTICAS_BUSCA = ("nos_expandidos", "custo_total")
+
+    def __init__(self, estrategia, capacidade=256):
+        self.estrategia = estrategia
+        self.capacidade = capacidade
+        self._cache = OrderedDict()
+        self._versao = None
+        self.acertos = 0
+        self.falhas = 0
+
+    def __getattr__(self, nome):
+        # Outros atributos da estratégia continuam acessíveis
+        return getattr(self.estrategia, nome)
+
+    def estatisticas(self):
+        consultas = self.acertos + self.falhas
+        return {
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+            "taxa_acertos": self.acertos / consultas if consultas else 0.0,
+            "entradas": len(self._cache),
+        }
+
+    def encontrar_caminho(self, inicio, fim, obstaculos_set, resolucao):
+        from grid_system import GridSystem
+        versao = GridSystem.getInstance().versao_layout
+        if versao != self._versao: # Layout mudou: nenhuma entrada antiga serve mais
+            self._cache.clear()
+            self._versao = versao
+
+        chave = (inicio, fim)
+        if chave in self._cache:
+            self._cache.move_to_end(chave)
+            self.acertos += 1
+            caminho, busca = self._cache[chave]
+            if "nos_expandidos" in busca:
+                busca = dict(busca, nos_expandidos=0) # Acerto: nenhum nó expandido nesta consulta
+        else:
+            self.falhas += 1
+            caminho = self.estrategia.encontrar_caminho(inicio, fim, obstaculos_set, resolucao)
+            busca = {nome: getattr(self.estrategia, nome) for nome in self.ESTATISTICAS_BUSCA
+                     if hasattr(self.estrategia, nome)}
+            self._cache[chave] = (caminho, busca)
+            if len(self._cache) > self.capacidade:
+                self._cache.popitem(last=False)
+        self.__dict__.update(busca) # Contadores desta consulta, não da busca anterior da estratégia
+        return list(caminho) if caminho else caminho # Cópia: quem chama pode alterar a lista
+
+# ==========================================
+# Busca hierárquica (HPA*)
+# ==========================================
+# O grid é dividido em clusters de TAMANHO_CLUSTER x TAMANHO_CLUSTER. Em cada
+# borda entre dois clusters, as arestas livres que a atravessam formam trechos
+# contínuos e cada trecho vira uma (ou duas, se for longo) entrada. O grafo
+# abstrato liga as entradas entre si (distância dentro do cluster, pré-calculada)
+# e através da borda (custo 1). A busca roda no grafo abstrato e depois cada
+# trecho é refinado por uma BFS local, restrita a um cluster.
+
+class HierarquiaClusters:
+    TRECHO_LONGO = 6 # A partir deste tamanho o trecho ganha uma entrada em cada ponta
+
+    def __init__(self, grid_singleton, tamanho):
+        self.grid = grid_singleton
+        self.tamanho = tamanho
+        self.versao = None # Versão do layout refletida nos clusters (None = montar tudo)
+        self.sujos = set()
+
+    # --- Montagem ---
+    def _montar(self):
+        grid, T = self.grid, self.tamanho
+        R = self.resolucao = grid.resolucao
+        self.primeiro, self.vizinhos = grid.tabela_vizinhos()
+        self.por_linha = -(-R // T) # Clusters por linha (divisão arredondada para cima)
+        self.cluster_de = array('i', [(i // R // T) * self.por_linha + (i % R) // T for i in range(R * R)])
+        self.bloqueado = bytearray(R * R)
+        for lin, col in grid.obstaculos:
+            self.bloqueado[lin * R + col] = 1
+
+        self.entradas = {} # (cluster a, cluster b), a < b -> [(id em a, id em b)]
+        self.intra = {}    # cluster -> {entrada: [(outra entrada, distância)]}
+        self.inter = {}    # entrada -> [entrada do outro lado da borda]
+        self.nos = {}      # cluster -> entradas dentro dele
+        n_clusters = self.por_linha * self.por_linha
+        for c in range(n_clusters):
+            self._atualizar_bordas(c)
+        for c in range(n_clusters):
+            self._atualizar_intra(c)
+        self.sujos.clear()
+        self.versao = grid.versao_layout
+
+    def invalidar(self, pos):
+        """Chamado pelo GridSystem depois de alternar um obstáculo em `pos`."""
+        if self.versao is None or self.versao != self.grid.versao_layout - 1:
+            self.versao = None # Perdeu alguma alteração: remonta tudo na próxima busca
+            return
+        R = self.resolucao
+        i = pos[0] * R + pos[1]
+        self.bloqueado[i] = 1 if pos in self.grid.obstaculos else 0
+        # O cluster da célula e os dos vizinhos dela (se estiver na borda)
+        self.sujos.add(self.cluster_de[i])
+        for k in range(self.primeiro[i], self.primeiro[i + 1]):
+            self.sujos.add(self.cluster_de[self.vizinhos[k]])
+        self.versao = self.grid.versao_layout
+
+    def atualizar(self):
+        if self.versao is None or self.versao != self.grid.versao_layout or self.resolucao != self.grid.resolucao:
+            self._montar()
+            return
+        if not self.sujos:
+            return
+        refazer_intra = set(self.sujos)
+        for c in self.sujos:
+            refazer_intra.update(self._atualizar_bordas(c))
+        for c in refazer_intra:
+            self._atualizar_intra(c)
+        self.sujos.clear()
+
+    def _celulas_da_borda(self, c):
+        R, T = self.resolucao, self.tamanho
+        lin0, col0 = (c // self.por_linha) * T, (c % self.por_linha) * T
+        lin1, col1 = min(lin0 + T, R) - 1, min(col0 + T, R) - 1
+        for lin in range(lin0, lin1 + 1):
+            if lin in (lin0, lin1):
+                cols = range(col0, col1 + 1)
+            else:
+                cols = (col0, col1) if col1 != col0 else (col0,)
+            for col in cols:
+                yield lin * R + col
+
+    def _atualizar_bordas(self, c):
+        """Recalcula as entradas entre `c` e os clusters vizinhos; retorna os vizinhos cujas entradas mudaram."""
+        primeiro, vizinhos, cluster_de, bloqueado = self.primeiro, self.vizinhos, self.cluster_de, self.bloqueado
+        arestas = {} # cluster vizinho -> [(u em c, v no vizinho)]
+        vizinhos_cluster = set()
+        for u in self._celulas_da_borda(c):
+            for k in range(primeiro[u], primeiro[u + 1]):
+                v = vizinhos[k]
+                outro = cluster_de[v]
+                if outro != c:
+                    vizinhos_cluster.add(outro)
+                    if not bloqueado[u] and not bloqueado[v]:
+                        arestas.setdefault(outro, []).append((u, v))
+
+        mudaram = []
+        for outro in vizinhos_cluster:
+            novas = self._agrupar_entradas(sorted(arestas.get(outro, [])))
+            chave = (c, outro) if c < outro else (outro, c)
+            if c > outro:
+                novas = [(v, u) for u, v in novas]
+            antigas = self.entradas.get(chave, [])
+            if antigas != novas:
+                for u, v in antigas:
+                    self.inter[u].remove(v)
+                    self.inter[v].remove(u)
+                self.entradas[chave] = novas
+                for u, v in novas:
+                    self.inter.setdefault(u, []).append(v)
+                    self.inter.setdefault(v, []).append(u)
+                # Uma célula pode ser entrada de mais de uma borda: só sai de `nos` sem nenhuma
+                for x in {x for aresta in antigas + novas for x in aresta}:
+                    nos = self.nos.setdefault(self.cluster_de[x], set())
+                    if self.inter[x]:
+                        nos.add(x)
+                    else:
+                        nos.discard(x)
+                mudaram.append(outro)
+        return mudaram
+
+    def _vizinhos_ou_iguais(self, a, b):
+        return a == b or b in self.vizinhos[self.primeiro[a]:self.primeiro[a + 1]]
+
+    def _agrupar_entradas(self, arestas):
+        # Trechos contínuos: arestas seguidas com os dois lados vizinhos (ou iguais)
+        entradas = []
+        trecho = []
+        for u, v in arestas:
+            if trecho and not (self._vizinhos_ou_iguais(trecho[-1][0], u) and self._vizinhos_ou_iguais(trecho[-1][1], v)):
+                entradas.extend(self._representantes(trecho))
+                trecho = []
+            trecho.append((u, v))
+        if trecho:
+            entradas.extend(self._representantes(trecho))
+        return entradas
+
+    def _representantes(self, trecho):
+        if len(trecho) >= self.TRECHO_LONGO:
+            return [trecho[0], trecho[-1]]
+        return [trecho[len(trecho) // 2]]
+
+    def _atualizar_intra(self, c):
+        nos = list(self.nos.get(c, ()))
+        arestas = {u: [] for u in nos}
+        # Distâncias são simétricas: a BFS de cada entrada só procura as seguintes
+        # da lista e para assim que todas forem alcançadas
+        for k, u in enumerate(nos):
+            alvos = set(nos[k + 1:])
+            if not alvos:
+                break
+            dist = self._bfs_local(u, c, alvos)[0]
+            for v in alvos:
+                if v in dist:
+                    arestas[u].append((v, dist[v]))
+                    arestas[v].append((u, dist[v]))
+        self.intra[c] = arestas
+
+    def _bfs_local(self, origem, c, alvos=None):
+        """
+        BFS restrita às células do cluster `c`; retorna (distâncias, pais). Com
+        `alvos` (conjunto de ids) para assim que todos tiverem sido alcançados.
+        """
+        primeiro, vizinhos, cluster_de, bloqueado = self.primeiro, self.vizinhos, self.cluster_de, self.bloqueado
+        dist = {origem: 0}
+        pai = {origem: origem}
+        faltam = len(alvos - {origem}) if alvos else -1
+        fila = deque([origem])
+        while fila and faltam:
+            atual = fila.popleft()
+            d = dist[atual] + 1
+            for k in range(primeiro[atual], primeiro[atual + 1]):
+                v = vizinhos[k]
+                if v not in dist and cluster_de[v] == c and not bloqueado[v]:
+                    dist[v] = d
+                    pai[v] = atual
+                    fila.append(v)
+                    if alvos and v in alvos:
+                        faltam -= 1
+        return dist, pai
+
+    # --- Consulta ---
+    def buscar(self, origem, destino, h):
+        """
+        A* no grafo abstrato com origem e destino inseridos temporariamente.
+        Retorna (lista de ids, nós expandidos) ou (None, nós expandidos).
+        """
+        self.atualizar()
+        if self.bloqueado[destino]:
+            return None, 0
+        c_origem, c_destino = self.cluster_de[origem], self.cluster_de[destino]
+        dist_origem = self._bfs_local(origem, c_origem)[0]
+        dist_destino = self._bfs_local(destino, c_destino)[0] # Grafo não direcionado
+        # Arestas temporárias: origem -> entradas do seu cluster, entradas do cluster do destino -> destino
+        saidas = [(u, dist_origem[u]) for u in self.nos.get(c_origem, ()) if u in dist_origem]
+        saidas += [(v, 1) for v in self.inter.get(origem, [])]
+        if c_origem == c_destino and destino in dist_origem:
+            saidas.append((destino, dist_origem[destino]))
+        chegadas = {u: dist_destino[u] for u in self.nos.get(c_destino, ()) if u in dist_destino}
+
+        custo = {origem: 0}
+        pai = {origem: None}
+        fechados = set()
+        contador = 0
+        fila = [(h(origem), contador, origem)]
+        expandidos = 0
+        while fila:
+            _, _, atual = heapq.heappop(fila)
+            if atual in fechados:
+                continue
+            fechados.add(atual)
+            expandidos += 1
+            if atual == destino:
+                abstrato = [atual]
+                while pai[abstrato[-1]] is not None:
+                    abstrato.append(pai[abstrato[-1]])
+                return self._refinar(abstrato[::-1]), expandidos
+
+            if atual == origem:
+                arestas = saidas
+            else:
+                arestas = self.intra[self.cluster_de[atual]].get(atual, []) + [(v, 1) for v in self.inter.get(atual, [])]
+                if atual in chegadas:
+                    arestas = arestas + [(destino, chegadas[atual])]
+            for v, peso in arestas:
+                if v in fechados:
+                    continue
+                novo_custo = custo[atual] + peso
+                if novo_custo < custo.get(v, novo_custo + 1):
+                    custo[v] = novo_custo
+                    pai[v] = atual
+                    contador += 1
+                    heapq.heappush(fila, (novo_custo + h(v), contador, v))
+        return None, expandidos
+
+    def _refinar(self, abstrato):
+        caminho = [abstrato[0]]
+        for x, y in zip(abstrato, abstrato[1:]):
+            c = self.cluster_de[x]
+            if self.cluster_de[y] != c: # Atravessa a borda: um passo
+                caminho.append(y)
+                continue
+            pai = self._bfs_local(x, c, {y})[1]
+            trecho = [y]
+            while trecho[-1] != x:
+                trecho.append(pai[trecho[-1]])
+            caminho.extend(reversed(trecho[:-1]))
+        return caminho
+
+class HPAAlgoritmo(IPathfinder):
+    """
+    HPA*: planeja no grafo abstrato de clusters do GridSystem e refina localmente.
+    Os obstáculos vêm do próprio GridSystem (obstaculos_set não é consultado) e
+    só os clusters tocados por toggle_obstaculo são recalculados. O caminho é
+    quase ótimo: pode ser um pouco mais longo que o da BFS.
+    """
+    def __init__(self):
+        self.nos_expandidos = 0
+
+    def encontrar_caminho(self, inicio, fim, obstaculos_set, resolucao):
+
+        from grid_system import GridSystem
+        grid_singleton = GridSystem.getInstance()
+        hierarquia = grid_singleton.obter_hierarquia()
+
+        h = lambda i: grid_singleton.distancia(divmod(i, resolucao), fim)
+        ids, self.nos_expandidos = hierarquia.buscar(inicio[0] * resolucao + inicio[1], fim[0] * resolucao + fim[1], h)
+        return [divmod(i, resolucao) for i in ids] if ids is not None else None
+
+# ==========================================
+# Planejamento cooperativo (tabela de reservas)
+# ==========================================
+
+class CooperativoAlgoritmo(IPathfinder):
+    """
+    A* cooperativo no espaço-tempo: os estados são (célula, tick) e esperar no
+    lugar também é uma ação. Usa a tabela de reservas do GridSystem para não
+    entrar numa célula que outro agente ocupa no tick de chegada ou no anterior,
+    nem sair de uma que outro ocupa no tick seguinte (sem trens de agentes nem
+    trocas de lugar frente a frente, que dependeriam da ordem de execução).
+    O caminho tem uma célula por tick a partir de `tick` (esperas repetem a
+    célula). As reservas valem por `horizonte` ticks; depois o tick satura e a
+    busca vira um A* comum, o que garante que ela termina. Só a janela é
+    reservada e o agente replaneja antes que ela acabe (WHCA*, ver
+    GridSystem.planejar_cooperativo).
+    """
+    def __init__(self, horizonte=None):
+        self.horizonte = CONFIG["HORIZONTE_RESERVA"] if horizonte is None else horizonte
+        self.nos_expandidos = 0
+
+    def encontrar_caminho(self, inicio, fim, obstaculos_set, resolucao, agente=None, tick=0):
+
+        from grid_system import GridSystem
+        grid_singleton = GridSystem.getInstance()
+        reservas = grid_singleton.reservas
+        primeiro, vizinhos = grid_singleton.tabela_vizinhos()
+        bloqueado = obter_nucleo(resolucao).carregar_obstaculos(obstaculos_set)
+        horizonte = self.horizonte
+
+        def reservado(i, t): # t = ticks desde `tick`
+            dono = reservas.get((divmod(i, resolucao), tick + t))
+            return dono is not None and dono is not agente
+
+        h = lambda i: grid_singleton.distancia(divmod(i, resolucao), fim)
+        destino = fim[0] * resolucao + fim[1]
+
+        # Estado = id * largura + t, com t saturado em `horizonte`
+        largura = horizonte + 1
+        inicial = (inicio[0] * resolucao + inicio[1]) * largura
+        pai = {inicial: inicial}
+        custo = {inicial: 0}
+        fechado = set()
+        contador = 0
+        fila = [(h(inicial // largura), 0, contador, inicial)]
+        self.nos_expandidos = 0
+        while fila:
+            _, _, _, estado = heapq.heappop(fila)
+            if estado in fechado:
+                continue
+            fechado.add(estado)
+            self.nos_expandidos += 1
+            atual, t = divmod(estado, largura)
+            if atual == destino:
+                caminho = [estado]
+                while pai[caminho[-1]] != caminho[-1]:
+                    caminho.append(pai[caminho[-1]])
+                return [divmod(e // largura, resolucao) for e in reversed(caminho)]
+
+            novo_custo = custo[estado] + 1
+            dentro = t < horizonte # Ainda na janela das reservas
+            proximo = min(t + 1, horizonte)
+            candidatos = list(vizinhos[primeiro[atual]:primeiro[atual + 1]])
+            if dentro:
+                candidatos.append(atual) # Esperar um tick
+            for vizinho in candidatos:
+                if bloqueado[vizinho]:
+                    continue
+                if dentro and reservado(vizinho, t + 1):
+                    continue
+                # Sem andar colado: a célula de destino não pode estar ocupada agora
+                # e a de origem não pode ser ocupada no tick seguinte (nem trocas)
+                if dentro and vizinho != atual and (reservado(vizinho, t) or reservado(atual, t + 1)):
+                    continue
+                novo = vizinho * largura + proximo
+                if novo in fechado:
+                    continue
+                if novo not in custo or novo_custo < custo[novo]:
+                    custo[novo] = novo_custo
+                    pai[novo] = estado
+                    h_vizinho = h(vizinho)
+                    contador += 1
+                    heapq.heappush(fila, (novo_custo + h_vizinho, h_vizinho, contador, novo))
+        return None
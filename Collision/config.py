@@ -3,9 +3,17 @@ CONFIG = {
     "LARGURA_TELA": 760,
     "ALTURA_TELA": 700,
     "GRID_RESOLUCAO": 20,
+    "ALGORITMO": "BFS_SIMPLES", # "BFS_SIMPLES", "ASTAR", "JPS", "DIJKSTRA", "HPA" ou "COOPERATIVO" (ver AlgoritmoFactory)
+    "CACHE_CAMINHOS": 0, # Caminhos guardados no cache LRU (0 = sem cache; ex.: 256)
+    "TAMANHO_CLUSTER": 10, # Lado dos clusters do HPA*
+    "DURACAO_TICK": 250,  # ms por tick da tabela de reservas (COOPERATIVO)
+    "HORIZONTE_RESERVA": 32, # Janela de reservas em ticks (o agente replaneja na metade dela)
+    "PASSO_SIMULACAO": 25, # ms por passo fixo da simulação (divide os atrasos de 250/500 ms)
+    "MAX_PASSOS_QUADRO": 10, # Passos fixos no máximo por quadro; o atraso além disso é descartado
     "NUM_FOGO": 5,        # Quantidade de fogos aleatórios
     "VIDA_INICIAL": 4,    # Vida do agente
     "DANO_FOGO": 1,       # Dano ao tentar entrar no fogo
+    "CUSTO_POR_DANO": 10, # Custo extra por ponto de dano no terreno ponderado (DIJKSTRA)
     "CORES": {
         "BRANCO": (255, 255, 255),
         "PRETO": (0, 0, 0),
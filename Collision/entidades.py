@@ -1,5 +1,9 @@
 # entidades.py
-import pygame
+# pygame só é necessário para desenhar: a simulação (simulacao.py) roda sem ele
+try:
+    import pygame
+except ImportError:
+    pygame = None
 from abc import ABC, abstractmethod
 from config import CONFIG
 
@@ -14,10 +18,17 @@ class EntidadeGrid(ABC):
     def get_dano(self):
         return 0
 
+    # Custo para entrar na célula (terreno ponderado); None = intransponível
+    def get_custo(self):
+        return 1
+
 class ObstaculoParede(EntidadeGrid):
     def desenhar(self, tela, rect):
         pygame.draw.rect(tela, CONFIG["CORES"]["PRETO"], rect)
 
+    def get_custo(self):
+        return None
+
 class PontoInicio(EntidadeGrid):
     def desenhar(self, tela, rect):
         pygame.draw.circle(tela, CONFIG["CORES"]["AZUL"], (rect.centerx, rect.centery), 6)
@@ -40,6 +51,9 @@ class EntidadeDecorator(EntidadeGrid):
     def get_dano(self):
         return self._wrappee.get_dano()
 
+    def get_custo(self):
+        return self._wrappee.get_custo()
+
 class ComportamentoFogoDecorator(EntidadeDecorator):
     def desenhar(self, tela, rect):
         self._wrappee.desenhar(tela, rect)
@@ -47,4 +61,8 @@ class ComportamentoFogoDecorator(EntidadeDecorator):
 
     # Sobrescreve para dar dano
     def get_dano(self):
-        return CONFIG["DANO_FOGO"]
\ No newline at end of file
+        return CONFIG["DANO_FOGO"]
+
+    # No Collision o agente entra no fogo (e leva dano): atravessável, mas caro
+    def get_custo(self):
+        return 1 + self.get_dano() * CONFIG["CUSTO_POR_DANO"]
\ No newline at end of file
@@ -1,5 +1,5 @@
 from entidades import ObstaculoParede, PontoInicio, PontoFim # Importa os produtos
-from algoritmos import BFSAlgoritmo # Importa o algoritmo
+from algoritmos import BFSAlgoritmo, AStarAlgoritmo, JPSAlgoritmo, DijkstraAlgoritmo, HPAAlgoritmo, CooperativoAlgoritmo, CacheCaminhos # Importa os algoritmos
 
 # ==========================================
 # 3. FÁBRICAS (Factory Method)
@@ -24,9 +24,20 @@ class PontoFactory:
 
 class AlgoritmoFactory:
     @staticmethod
-    def get_algoritmo(tipo="BFS_SIMPLES"):
-        if tipo == "BFS_SIMPLES":
-            return BFSAlgoritmo()
-        # Futuro: elif tipo == "DIAGONAL": return BFSDiagonal()
-        # Futuro: elif tipo == "ASTAR": return AStarAlgoritmo()
-        return BFSAlgoritmo()
\ No newline at end of file
+    def get_algoritmo(tipo="BFS_SIMPLES", cache=0):
+        if tipo == "ASTAR":
+            algoritmo = AStarAlgoritmo()
+        elif tipo == "JPS": # Só grids retangulares
+            algoritmo = JPSAlgoritmo()
+        elif tipo == "DIJKSTRA": # Terreno ponderado (get_custo das entidades)
+            algoritmo = DijkstraAlgoritmo()
+        elif tipo == "HPA": # Hierárquico, para grids grandes
+            algoritmo = HPAAlgoritmo()
+        elif tipo == "COOPERATIVO": # Multiagente: A* no espaço-tempo com a tabela de reservas
+            return CooperativoAlgoritmo() # Sem cache: o caminho depende das reservas e do tick
+        # Futuro: elif tipo == "DIAGONAL": algoritmo = BFSDiagonal()
+        else:
+            algoritmo = BFSAlgoritmo()
+        if cache: # Capacidade do cache LRU de caminhos (0 = sem cache)
+            return CacheCaminhos(algoritmo, cache)
+        return algoritmo
\ No newline at end of file
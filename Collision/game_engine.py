@@ -1,22 +1,11 @@
 # game_engine.py
 import pygame
-import random
-import time
 from config import CONFIG
 from chains import PygameInitHandler, DisplayInitHandler, GridInitHandler
-from commands import CommandManager, MoverAgenteCommand
-from agentes import Agente, AgenteIA, Observer
-from fabricas import AlgoritmoFactory
 from entidades import EntidadeDecorator
+from simulacao import Simulacao
 
-# Tipagem
-from typing import List
-try:
-    from agentes import AgenteIA
-except ImportError:
-    class AgenteIA: pass
-
-class GameEngine(Observer):
+class GameEngine:
     def __init__(self):
         self.tela = None
         self.grid = None
@@ -31,64 +20,15 @@ class GameEngine(Observer):
         
         self.modo = "OBSTACULOS"
         self.rodando = True
-        self.pathfinder = AlgoritmoFactory.get_algoritmo("BFS_SIMPLES")
-        
-        self.command_manager = CommandManager()
-        self.agentes_ativos: List[AgenteIA] = [] 
-
-    def update(self, evento, dados):
-        if evento == "morreu":
-            agente_morto = dados
-            print(f">>> AGENTE {agente_morto.pos} MORREU! Removendo...")
-            if agente_morto in self.agentes_ativos:
-                self.agentes_ativos.remove(agente_morto)
-                if agente_morto.intenção_atual in self.grid.lista_intencao:
-                    del self.grid.lista_intencao[agente_morto.intenção_atual]
-
-    def controlar_agentes_ia(self):
-        tempo_atual = pygame.time.get_ticks()
         
-        # 1. Atualizar a Lista de Intenção Global
-        # Limpar e recriar com base no que cada agente QUER fazer (ou onde está parado)
-        self.grid.lista_intencao.clear()
-        for agente in self.agentes_ativos:
-            self.grid.lista_intencao[agente.intenção_atual] = agente
-
-        # 2. Executar Lógica Individual
-        for agente in list(self.agentes_ativos):
-            if agente.pos == agente.pos_final:
-                self.agentes_ativos.remove(agente)
-                continue
-            
-            # Verifica se está na hora deste agente se mover
-            if agente.verificar_tempo(tempo_atual):
-                
-                # Planeja (Retorna movimento ou 0,0 se esperar/desviar)
-                # Passar a lista de agentes para ele checar colisão física
-                delta = agente.planejar_movimento(self.grid, self.agentes_ativos)
-                
-                if delta:
-                    dx, dy = delta
-                    nova_pos = agente.pos[0] + dx, agente.pos[1] + dy
-                    
-                    if nova_pos != agente.pos:
-                        # Aplica Dano se houver
-                        if nova_pos in self.grid.obstaculos:
-                             dano = self.grid.obstaculos[nova_pos].get_dano()
-                             if dano > 0:
-                                agente.receber_dano(dano)
-                        
-                        # Executa Movimento
-                        cmd = MoverAgenteCommand(agente, dx, dy)
-                        self.command_manager.executar(cmd)
-                        
-                        # Atualiza Intenção no Grid (Remove da velha, põe na nova)
-                        if agente.pos in self.grid.lista_intencao:
-                            del self.grid.lista_intencao[agente.pos]
-                        self.grid.lista_intencao[agente.intenção_atual] = agente
+        # Agentes, agenda e relógio lógico ficam na simulação (roda sem pygame);
+        # a engine só cuida de eventos, desenho e do relógio real
+        self.simulacao = Simulacao(self.grid)
+        self.command_manager = self.simulacao.command_manager
 
-                # Agenda o próximo movimento (sorteia 250 ou 500ms)
-                agente.agendar_proximo_movimento(tempo_atual)
+    @property
+    def agentes_ativos(self):
+        return self.simulacao.agentes_ativos
 
     def processar_eventos(self):
         for evento in pygame.event.get():
@@ -101,7 +41,7 @@ class GameEngine(Observer):
                 if evento.key == pygame.K_s: self.alternar_modo()
                 if evento.key == pygame.K_c: 
                     self.grid.limpar()
-                    self.agentes_ativos.clear()
+                    self.simulacao.limpar()
                     self.modo = "OBSTACULOS"
                 if evento.key == pygame.K_a:
                     self.grid.gerar_aleatorio()
@@ -124,39 +64,10 @@ class GameEngine(Observer):
         elif self.modo == "CAMINHOS": 
             self.modo = "OBSTACULOS"
             self.grid.caminhos.clear()
-            self.agentes_ativos.clear()
+            self.simulacao.limpar()
     
     def recalcular_caminhos(self):
-        self.grid.caminhos.clear()
-        self.agentes_ativos.clear()
-        self.grid.lista_intencao.clear()
-        
-        cores = [CONFIG["CORES"]["AZUL"], CONFIG["CORES"]["VERDE"], CONFIG["CORES"]["VERMELHO"], CONFIG["CORES"]["LARANJA"]]
-        pares = min(len(self.grid.pontos_inicio), len(self.grid.pontos_fim))
-        
-        tempo_atual = pygame.time.get_ticks()
-
-        for i in range(pares):
-            inicio = self.grid.pontos_inicio[i].pos
-            fim = self.grid.pontos_fim[i].pos
-            cor = cores[i % len(cores)]
-            
-            caminho_completo = self.pathfinder.encontrar_caminho(
-                inicio, fim, self.grid.obstaculos.keys(), self.grid.resolucao
-            )
-            
-            if caminho_completo and len(caminho_completo) > 1:
-                agente_ia = AgenteIA(inicio, fim, caminho_completo[1:], cor)
-                agente_ia.attach(self)
-                # Inicia o timer do agente
-                agente_ia.agendar_proximo_movimento(tempo_atual)
-                self.agentes_ativos.append(agente_ia)
-                
-                # Adiciona caminho para visualização (opcional)
-                self.grid.caminhos.append((caminho_completo, cor))
-                
-        if self.agentes_ativos:
-            print(f"Controle IA ATIVADO: {len(self.agentes_ativos)} agentes.")
+        self.simulacao.criar_agentes()
 
     def desenhar(self):
         self.tela.fill(CONFIG["CORES"]["BRANCO"])
@@ -207,7 +118,8 @@ class GameEngine(Observer):
     def run(self):
         while self.rodando:
             self.processar_eventos()
-            self.controlar_agentes_ia()
+            # Passos fixos da simulação até alcançar o relógio real
+            self.simulacao.avancar_ate(pygame.time.get_ticks())
             self.desenhar()
             self.clock.tick(30)
         pygame.quit()
\ No newline at end of file
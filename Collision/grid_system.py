@@ -1,19 +1,28 @@
 # grid_system.py
-import pygame
+# pygame só é necessário para desenhar: a simulação (simulacao.py) roda sem ele
+try:
+    import pygame
+except ImportError:
+    pygame = None
+import heapq
 import random
+from array import array
+from collections import deque
 from config import CONFIG
 from fabricas import ObstaculoFactory, PontoFactory, AlgoritmoFactory
 from adapters import RetangularAdapter, IGridAdapter, HexagonalAdapter
+from algoritmos import HierarquiaClusters
 from entidades import ComportamentoFogoDecorator, EntidadeGrid, ObstaculoParede, PontoInicio, PontoFim 
 from math import sqrt, ceil
-from typing import Dict, Tuple, List 
+from typing import Dict, Tuple, List, Set 
 
 try:
-    from agentes import AgenteIA
+    from agentes import AgenteIA, Observer
 except ImportError:
     class AgenteIA: pass
+    class Observer: pass
 
-class GridSystem:
+class GridSystem(Observer):
     _instance = None 
 
     @staticmethod
@@ -29,12 +38,27 @@ class GridSystem:
             raise Exception("Singleton violado!")
         
         self.obstaculos: Dict[Tuple[int, int], EntidadeGrid] = {}
+        self.versao_layout = 0 # Muda a cada alteração nos obstáculos (chave do cache de caminhos)
+        self._custos = None # Grade de custos empacotada e a versão do layout em que foi montada
+        self._versao_custos = -1
+        self.hierarquia = None # Clusters do HPA*, criados na primeira busca hierárquica
         self.pontos_inicio: List[PontoInicio] = []
         self.pontos_fim: List[PontoFim] = []
         self.caminhos: List[Tuple[List, Tuple]] = []
         
         self.lista_intencao: Dict[Tuple[int, int], AgenteIA] = {}
-        self.pathfinder_ia = AlgoritmoFactory.get_algoritmo("BFS_SIMPLES")
+        # Mapa de ocupação física: célula -> agente parado nela (atualizado pelo Observer "moveu")
+        self.ocupacao: Dict[Tuple[int, int], AgenteIA] = {}
+        self.agentes_registrados: Set[AgenteIA] = set() # Só eventos destes agentes mexem nos mapas
+        # Tabela de reservas espaço-tempo: (célula, tick) -> agente que estará nela
+        self.reservas: Dict[Tuple[Tuple[int, int], int], AgenteIA] = {}
+        self._reservas_agente: Dict[AgenteIA, List[Tuple[Tuple[int, int], int]]] = {}
+        self.pathfinder_ia = AlgoritmoFactory.get_algoritmo(CONFIG["ALGORITMO"], CONFIG["CACHE_CAMINHOS"])
+        self.planejador_cooperativo = AlgoritmoFactory.get_algoritmo("COOPERATIVO")
+
+        # Campos de fluxo: destino -> distâncias (válidos enquanto versao_layout não muda)
+        self._campos: Dict[Tuple[int, int], array] = {}
+        self._versao_campos = None # (versao_layout, ponderado) em que os campos foram calculados
             
         self.largura_tela, self.altura_tela = tela_size
         self.resolucao = CONFIG["GRID_RESOLUCAO"]
@@ -42,16 +66,17 @@ class GridSystem:
         
         margem_sup = 50
         margem = 20
-        self.rect_area = pygame.Rect(margem, margem_sup, 
-                                     self.largura_tela - 2*margem, 
-                                     self.altura_tela - margem_sup - margem)
+        largura_area = self.largura_tela - 2*margem
+        altura_area = self.altura_tela - margem_sup - margem
+        # Sem pygame (simulação headless) não há área de desenho
+        self.rect_area = pygame.Rect(margem, margem_sup, largura_area, altura_area) if pygame else None
         
         if self.geometria == "HEXAGONAL":
-            self.altura_celula = self.rect_area.height / (self.resolucao * 0.75 + 0.25)
+            self.altura_celula = altura_area / (self.resolucao * 0.75 + 0.25)
             self.largura_celula = self.altura_celula * (sqrt(3) / 2)
         else:
-            self.largura_celula = self.rect_area.width / self.resolucao
-            self.altura_celula = self.rect_area.height / self.resolucao
+            self.largura_celula = largura_area / self.resolucao
+            self.altura_celula = altura_area / self.resolucao
 
         self.geometria_adapter = self._configurar_geometria(geometria)
 
@@ -66,6 +91,128 @@ class GridSystem:
     def obter_vizinhos(self, lin, col):
         return self.geometria_adapter.obter_vizinhos(lin, col, self.resolucao)
 
+    def distancia(self, a, b):
+        return self.geometria_adapter.distancia(a, b)
+
+    def tabela_vizinhos(self):
+        return self.geometria_adapter.tabela_vizinhos(self.resolucao)
+
+    def obter_hierarquia(self):
+        if self.hierarquia is None:
+            self.hierarquia = HierarquiaClusters(self, CONFIG["TAMANHO_CLUSTER"])
+        return self.hierarquia
+
+    def grade_custos(self):
+        """
+        Custo de entrar em cada célula (id = lin * resolucao + col) num array plano:
+        1 no terreno livre, get_custo() das entidades nos obstáculos e 0 para
+        intransponível. Remontada só quando o layout muda.
+        """
+        if self._versao_custos != self.versao_layout:
+            R = self.resolucao
+            custos = array('i', [1]) * (R * R)
+            for (lin, col), entidade in self.obstaculos.items():
+                custo = entidade.get_custo()
+                custos[lin * R + col] = 0 if custo is None else custo
+            self._custos = custos
+            self._versao_custos = self.versao_layout
+        return self._custos
+
+    # --- Campos de fluxo (um por destino) ---
+    def campo_distancias(self, destino):
+        """
+        Distância de cada célula (id = lin * resolucao + col) até `destino`,
+        calculada por uma busca reversa a partir dele; -1 = inalcançável. Com
+        ALGORITMO "DIJKSTRA" o campo soma os custos de grade_custos() (o fogo é
+        atravessável, mas caro), como o DijkstraAlgoritmo; nos outros modos conta
+        passos e todo obstáculo bloqueia, como as outras estratégias. Agentes com
+        o mesmo destino compartilham o campo, que vale até o layout mudar.
+        """
+        ponderado = CONFIG["ALGORITMO"] == "DIJKSTRA"
+        if self._versao_campos != (self.versao_layout, ponderado):
+            self._campos.clear()
+            self._versao_campos = (self.versao_layout, ponderado)
+        if destino not in self._campos:
+            self._campos[destino] = self._calcular_campo_ponderado(destino) if ponderado else self._calcular_campo(destino)
+        return self._campos[destino]
+
+    def _calcular_campo(self, destino):
+        R = self.resolucao
+        dist = array('i', [-1]) * (R * R)
+        if destino in self.obstaculos:
+            return dist
+        bloqueado = bytearray(R * R)
+        for lin, col in self.obstaculos:
+            bloqueado[lin * R + col] = 1
+
+        primeiro, vizinhos = self.tabela_vizinhos()
+        origem = destino[0] * R + destino[1]
+        dist[origem] = 0
+        fila = deque([origem])
+        while fila:
+            atual = fila.popleft()
+            d = dist[atual] + 1
+            for k in range(primeiro[atual], primeiro[atual + 1]):
+                vizinho = vizinhos[k]
+                if dist[vizinho] < 0 and not bloqueado[vizinho]:
+                    dist[vizinho] = d
+                    fila.append(vizinho)
+        return dist
+
+    def _calcular_campo_ponderado(self, destino):
+        # Dijkstra reverso: ir de um vizinho para `atual` custa custos[atual]
+        R = self.resolucao
+        dist = array('i', [-1]) * (R * R)
+        custos = self.grade_custos()
+        origem = destino[0] * R + destino[1]
+        if not custos[origem]:
+            return dist
+
+        primeiro, vizinhos = self.tabela_vizinhos()
+        dist[origem] = 0
+        fila = [(0, origem)]
+        while fila:
+            d, atual = heapq.heappop(fila)
+            if d > dist[atual]:
+                continue
+            d += custos[atual]
+            for k in range(primeiro[atual], primeiro[atual + 1]):
+                vizinho = vizinhos[k]
+                if custos[vizinho] and (dist[vizinho] < 0 or d < dist[vizinho]):
+                    dist[vizinho] = d
+                    heapq.heappush(fila, (d, vizinho))
+        return dist
+
+    def proximo_passo(self, pos, destino):
+        """Vizinho de `pos` no caminho de menor custo até `destino` segundo o campo (consulta local), ou None."""
+        R = self.resolucao
+        dist = self.campo_distancias(destino)
+        custos = self.grade_custos() if self._versao_campos[1] else None # Campo ponderado
+        atual = pos[0] * R + pos[1]
+        # Partindo de uma célula fora do campo (ex.: fogo sem pesos) dist[atual] é -1: aceita qualquer vizinho alcançável
+        limite = dist[atual] if dist[atual] >= 0 else float('inf')
+        melhor, melhor_total = None, None
+        primeiro, vizinhos = self.tabela_vizinhos()
+        for k in range(primeiro[atual], primeiro[atual + 1]):
+            vizinho = vizinhos[k]
+            d = dist[vizinho]
+            if d < 0:
+                continue
+            total = d + (custos[vizinho] if custos is not None else 1)
+            if total <= limite and (melhor is None or total < melhor_total):
+                melhor, melhor_total = vizinho, total
+        return divmod(melhor, R) if melhor is not None else None
+
+    def caminho_pelo_campo(self, inicio, destino):
+        """Caminho mínimo [inicio, ..., destino] seguindo o campo de fluxo; None se inalcançável."""
+        caminho = [inicio]
+        while caminho[-1] != destino:
+            passo = self.proximo_passo(caminho[-1], destino)
+            if passo is None:
+                return None
+            caminho.append(passo)
+        return caminho
+
     def pixel_para_grid(self, pos_pixel):
         if not self.rect_area.collidepoint(pos_pixel):
             return None
@@ -138,12 +285,108 @@ class GridSystem:
         ]
         return [(int(px), int(py)) for px, py in pontos]
 
+    # --- Ocupação por agentes (Observer) ---
+    def registrar_agente(self, agente):
+        self.agentes_registrados.add(agente)
+        self.ocupacao[agente.pos] = agente
+        self.lista_intencao[agente.intenção_atual] = agente
+        agente.attach(self)
+
+    def remover_agente(self, agente):
+        self.agentes_registrados.discard(agente)
+        if self.ocupacao.get(agente.pos) is agente:
+            del self.ocupacao[agente.pos]
+        if self.lista_intencao.get(agente.intenção_atual) is agente:
+            del self.lista_intencao[agente.intenção_atual]
+        self.liberar_reservas(agente)
+
+    def limpar_agentes(self):
+        self.agentes_registrados.clear()
+        self.lista_intencao.clear()
+        self.ocupacao.clear()
+        self.limpar_reservas()
+
+    def update(self, evento, dados):
+        if evento in ("moveu", "intencao") and dados[0] not in self.agentes_registrados:
+            return # Agente já removido (morto, chegou ou desfeito pelo Undo): não volta aos mapas
+        if evento == "moveu":
+            agente, pos_anterior, nova_pos = dados
+            if self.ocupacao.get(pos_anterior) is agente:
+                del self.ocupacao[pos_anterior]
+            self.ocupacao[nova_pos] = agente
+        elif evento == "intencao":
+            # Só a reserva que mudou é tocada (não reconstrói a lista a cada frame)
+            agente, anterior, nova = dados
+            if self.lista_intencao.get(anterior) is agente:
+                del self.lista_intencao[anterior]
+            self.lista_intencao[nova] = agente
+        elif evento == "morreu":
+            self.remover_agente(dados)
+
+    # --- Tabela de reservas (planejamento cooperativo) ---
+    def reservar_caminho(self, agente, caminho, tick):
+        """
+        Reserva caminho[k] para o agente no tick `tick + k`, trocando as reservas antigas dele.
+        Não sobrescreve a reserva de outro agente: se alguma (célula, tick) já tiver dono,
+        nada muda e as chaves em conflito são retornadas (lista vazia = reservado).
+        """
+        chaves = [(pos, tick + k) for k, pos in enumerate(caminho)]
+        conflitos = [chave for chave in chaves if self.reservas.get(chave, agente) is not agente]
+        if conflitos:
+            return conflitos
+        self.liberar_reservas(agente)
+        for chave in chaves:
+            self.reservas[chave] = agente
+        self._reservas_agente[agente] = chaves
+        return conflitos
+
+    def liberar_reservas(self, agente):
+        for chave in self._reservas_agente.pop(agente, ()):
+            if self.reservas.get(chave) is agente:
+                del self.reservas[chave]
+
+    def limpar_reservas(self):
+        self.reservas.clear()
+        self._reservas_agente.clear()
+
+    def planejar_cooperativo(self, agente, tick):
+        """
+        Planeja o agente a partir de (agente.pos, tick) desviando das reservas dos
+        outros (WHCA*): só os HORIZONTE_RESERVA primeiros ticks da rota são reservados
+        e o agente replaneja na metade da janela, antes que as reservas acabem.
+        O caminho tem uma célula por tick (esperas repetem a célula). Sem rota, o
+        agente segura a célula onde está e tenta de novo no tick seguinte.
+        """
+        horizonte = self.planejador_cooperativo.horizonte
+        self.liberar_reservas(agente)
+        caminho = self.planejador_cooperativo.encontrar_caminho(
+            agente.pos, agente.pos_final, self.obstaculos.keys(), self.resolucao, agente, tick
+        )
+        if caminho:
+            conflitos = self.reservar_caminho(agente, caminho[:horizonte + 1], tick)
+            if not conflitos:
+                agente.caminho_planejado = caminho[1:]
+                agente.tick_replanejar = tick + max(1, horizonte // 2)
+                return caminho
+            print(f"Agente {agente.pos}: reservas já tomadas em {conflitos}, aguardando...")
+
+        espera = [agente.pos]
+        while len(espera) <= horizonte and (agente.pos, tick + len(espera)) not in self.reservas:
+            espera.append(agente.pos)
+        self.reservar_caminho(agente, espera, tick)
+        agente.caminho_planejado = []
+        agente.tick_replanejar = tick + 1
+        return None
+
     # --- Lógica de Jogo ---
     def toggle_obstaculo(self, pos):
         if pos in self.obstaculos:
             del self.obstaculos[pos]
         else:
             self.obstaculos[pos] = ObstaculoFactory.criar("PAREDE", pos)
+        self.versao_layout += 1
+        if self.hierarquia is not None: # Só os clusters em volta de pos são recalculados
+            self.hierarquia.invalidar(pos)
 
     def adicionar_ponto(self, pos):
         if pos in self.obstaculos: return
@@ -154,23 +397,25 @@ class GridSystem:
 
     def limpar(self):
         self.obstaculos.clear()
+        self.versao_layout += 1
         self.pontos_inicio.clear()
         self.pontos_fim.clear()
         self.caminhos.clear()
-        self.lista_intencao.clear()
+        self.limpar_agentes()
 
-    def gerar_aleatorio(self):
+    def gerar_aleatorio(self, rng=random):
         self.limpar()
         n_obstaculos = int((self.resolucao**2) * 0.2)
         while len(self.obstaculos) < n_obstaculos:
-            pos = (random.randint(0, self.resolucao-1), random.randint(0, self.resolucao-1))
+            pos = (rng.randint(0, self.resolucao-1), rng.randint(0, self.resolucao-1))
             if pos != (0,1) and pos != (1,1): 
                 self.toggle_obstaculo(pos)
         count_fogo = 0
         while count_fogo < CONFIG["NUM_FOGO"]:
-            pos = (random.randint(0, self.resolucao-1), random.randint(0, self.resolucao-1))
+            pos = (rng.randint(0, self.resolucao-1), rng.randint(0, self.resolucao-1))
             if pos not in self.obstaculos and pos != (0,1) and pos != (1,1):
                 parede = ObstaculoFactory.criar("PAREDE", pos)
                 fogo = ComportamentoFogoDecorator(parede)
                 self.obstaculos[pos] = fogo
-                count_fogo += 1
\ No newline at end of file
+                count_fogo += 1
+        self.versao_layout += 1 # Fogos entram direto no dicionário
\ No newline at end of file
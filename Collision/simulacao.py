@@ -0,0 +1,239 @@
+# simulacao.py
+import argparse
+import os
+import random
+import time
+from collections import Counter
+from contextlib import nullcontext, redirect_stdout
+from config import CONFIG
+from commands import CommandManager, MoverAgenteCommand
+from agentes import AgenteIA, Observer
+from agenda import AgendaMovimentos
+from fabricas import AlgoritmoFactory
+from grid_system import GridSystem
+
+# Tipagem
+from typing import List
+
+# ==========================================
+# NÚCLEO DA SIMULAÇÃO (Timestep Fixo)
+# ==========================================
+# A simulação tem relógio lógico próprio (self.tempo, em ms) e avança em passos
+# fixos de PASSO_SIMULACAO ms. Com semente, os sorteios dos agentes (tempo de
+# movimento e evasão) vêm de um random.Random próprio, então a mesma semente
+# reproduz a mesma execução. Não depende de pygame: o GameEngine só chama
+# avancar_ate() com o relógio real e desenha.
+#
+# Exemplo (sem tela):
+#   python simulacao.py --semente 7 --ticks 10000 --agentes 30
+
+class Simulacao(Observer):
+    def __init__(self, grid, semente=None, passo_ms=None):
+        self.grid = grid
+        # Sem semente usa o módulo random (mesmo comportamento do jogo interativo)
+        self.rng = random.Random(semente) if semente is not None else random
+        self.passo_ms = CONFIG["PASSO_SIMULACAO"] if passo_ms is None else passo_ms
+        self.max_passos_quadro = CONFIG["MAX_PASSOS_QUADRO"]
+        self.tempo = 0 # Relógio lógico (ms)
+        self.ticks = 0
+
+        self.pathfinder = AlgoritmoFactory.get_algoritmo(CONFIG["ALGORITMO"], CONFIG["CACHE_CAMINHOS"])
+        self.command_manager = CommandManager()
+        self.agentes_ativos: List[AgenteIA] = []
+        self.agenda = AgendaMovimentos() # Acorda só os agentes com movimento vencido
+        self.chegaram = 0
+        self.morreram = 0
+
+    def update(self, evento, dados):
+        if evento == "morreu":
+            agente_morto = dados
+            print(f">>> AGENTE {agente_morto.pos} MORREU! Removendo...")
+            if agente_morto in self.agentes_ativos:
+                self.agentes_ativos.remove(agente_morto) # O grid libera a ocupação e a intenção
+                self.agenda.remover(agente_morto)
+                self.morreram += 1
+
+    def limpar(self):
+        self.agentes_ativos.clear()
+        self.agenda.limpar()
+        self.grid.limpar_agentes()
+
+    def criar_agentes(self):
+        """Um agente por par início/fim do grid, partindo do tempo lógico atual."""
+        self.grid.caminhos.clear()
+        self.limpar()
+
+        cores = [CONFIG["CORES"]["AZUL"], CONFIG["CORES"]["VERDE"], CONFIG["CORES"]["VERMELHO"], CONFIG["CORES"]["LARANJA"]]
+        pares = min(len(self.grid.pontos_inicio), len(self.grid.pontos_fim))
+
+        tempo_atual = self.tempo
+        # Cooperativo: os agentes são planejados em ordem e cada um desvia das
+        # células que os anteriores reservaram na tabela espaço-tempo do grid
+        cooperativo = CONFIG["ALGORITMO"] == "COOPERATIVO"
+        tick = tempo_atual // CONFIG["DURACAO_TICK"]
+        # Destino com mais de um par: os caminhos saem do campo de fluxo dele (uma
+        # busca reversa compartilhada); destino único usa a estratégia configurada
+        pares_por_fim = Counter(self.grid.pontos_fim[i].pos for i in range(pares))
+        if cooperativo:
+            # Quem ainda não foi planejado fica parado no início durante a janela inteira
+            agentes = [AgenteIA(self.grid.pontos_inicio[i].pos, self.grid.pontos_fim[i].pos, [],
+                                cores[i % len(cores)], cooperativo=True, rng=self.rng) for i in range(pares)]
+            for agente_ia in agentes:
+                self.grid.reservar_caminho(agente_ia, [agente_ia.pos] * (CONFIG["HORIZONTE_RESERVA"] + 1), tick)
+
+        for i in range(pares):
+            inicio = self.grid.pontos_inicio[i].pos
+            fim = self.grid.pontos_fim[i].pos
+            cor = cores[i % len(cores)]
+
+            if cooperativo:
+                agente_ia = agentes[i]
+                caminho_completo = self.grid.planejar_cooperativo(agente_ia, tick)
+            elif pares_por_fim[fim] > 1:
+                caminho_completo = self.grid.caminho_pelo_campo(inicio, fim)
+            else:
+                caminho_completo = self.pathfinder.encontrar_caminho(
+                    inicio, fim, self.grid.obstaculos.keys(), self.grid.resolucao
+                )
+
+            if caminho_completo and len(caminho_completo) > 1:
+                if not cooperativo:
+                    agente_ia = AgenteIA(inicio, fim, caminho_completo[1:], cor, rng=self.rng)
+                agente_ia.attach(self)
+                self.grid.registrar_agente(agente_ia) # O grid também observa: mapa de ocupação
+                # Inicia o timer do agente
+                agente_ia.agendar_proximo_movimento(tempo_atual)
+                self.agentes_ativos.append(agente_ia)
+                self.agenda.adicionar(agente_ia)
+
+                # Adiciona caminho para visualização (opcional)
+                self.grid.caminhos.append((caminho_completo, cor))
+            elif cooperativo:
+                self.grid.liberar_reservas(agente_ia)
+
+        if self.agentes_ativos:
+            print(f"Controle IA ATIVADO: {len(self.agentes_ativos)} agentes.")
+
+    def passo(self):
+        """Avança o relógio lógico em um passo fixo e move os agentes vencidos."""
+        self.tempo += self.passo_ms
+        self.ticks += 1
+        tempo_atual = self.tempo
+
+        # A Lista de Intenção Global é mantida pelo grid: cada agente avisa (Observer)
+        # quando muda de intenção, então não há reconstrução por passo.
+        # Só os agentes com movimento vencido saem da agenda (na ordem de agentes_ativos)
+        for agente in self.agenda.vencidos(tempo_atual):
+            if agente.pos == agente.pos_final:
+                self.agentes_ativos.remove(agente)
+                self.grid.remover_agente(agente)
+                self.agenda.remover(agente)
+                self.chegaram += 1
+                continue
+
+            # Planeja (Retorna movimento ou 0,0 se esperar/desviar)
+            # A colisão física é checada no mapa de ocupação do grid
+            delta = agente.planejar_movimento(self.grid)
+
+            if delta:
+                dx, dy = delta
+                nova_pos = agente.pos[0] + dx, agente.pos[1] + dy
+
+                if nova_pos != agente.pos:
+                    # Aplica Dano se houver
+                    if nova_pos in self.grid.obstaculos:
+                         dano = self.grid.obstaculos[nova_pos].get_dano()
+                         if dano > 0:
+                            agente.receber_dano(dano)
+
+                    # Executa Movimento (quem morreu no dano já saiu da simulação)
+                    if agente.vida > 0:
+                        cmd = MoverAgenteCommand(agente, dx, dy)
+                        self.command_manager.executar(cmd)
+
+            # Agenda o próximo movimento (sorteia 250 ou 500ms); quem chegou ao
+            # destino volta no próximo passo só para ser removido
+            agente.agendar_proximo_movimento(tempo_atual)
+            self.agenda.agendar(agente, tempo_atual if agente.pos == agente.pos_final else None)
+
+    def avancar_ate(self, tempo_real):
+        """
+        Executa quantos passos fixos couberem até tempo_real (laço de jogo com timestep fixo),
+        no máximo MAX_PASSOS_QUADRO por chamada. Se o quadro atrasou mais que isso, o resto
+        do atraso é descartado: alcançá-lo deixaria o próximo quadro ainda mais lento
+        (espiral da morte) e a simulação só fica mais lenta que o relógio real.
+        """
+        if not self.agentes_ativos:
+            # Ociosa: o relógio lógico só acompanha o real, sem passos vazios
+            self.tempo = max(self.tempo, tempo_real - tempo_real % self.passo_ms)
+        passos = 0
+        while self.tempo + self.passo_ms <= tempo_real:
+            if passos == self.max_passos_quadro:
+                self.tempo = tempo_real - tempo_real % self.passo_ms
+                break
+            self.passo()
+            passos += 1
+
+    def executar(self, ticks):
+        """Roda até `ticks` passos ou até não sobrar agente; retorna quantos passos rodou."""
+        inicio = self.ticks
+        while self.ticks - inicio < ticks and self.agentes_ativos:
+            self.passo()
+        return self.ticks - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulação do Collision sem pygame (timestep fixo)")
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--ticks", type=int, default=10000, help="Máximo de passos fixos")
+    parser.add_argument("--agentes", type=int, default=30, help="Pares início/fim sorteados")
+    parser.add_argument("--destinos", type=int, default=0, help="Fins distintos divididos entre os agentes (0 = um por agente)")
+    parser.add_argument("--resolucao", type=int, default=CONFIG["GRID_RESOLUCAO"])
+    parser.add_argument("--geometria", default="RETANGULAR", choices=["RETANGULAR", "HEXAGONAL"])
+    parser.add_argument("--algoritmo", default=CONFIG["ALGORITMO"])
+    parser.add_argument("--cache", type=int, default=CONFIG["CACHE_CAMINHOS"], help="Capacidade do cache de caminhos (0 = sem cache)")
+    parser.add_argument("--verboso", action="store_true", help="Mostra as mensagens dos agentes")
+    args = parser.parse_args()
+
+    CONFIG["GRID_RESOLUCAO"] = args.resolucao
+    CONFIG["ALGORITMO"] = args.algoritmo
+    CONFIG["CACHE_CAMINHOS"] = args.cache
+    grid = GridSystem.getInstance((CONFIG["LARGURA_TELA"], CONFIG["ALTURA_TELA"]), args.geometria)
+    simulacao = Simulacao(grid, args.semente)
+
+    # Cenário sorteado com a mesma semente: obstáculos, fogo e pares em células livres
+    grid.gerar_aleatorio(simulacao.rng)
+    R = grid.resolucao
+    livres = [(lin, col) for lin in range(R) for col in range(R) if (lin, col) not in grid.obstaculos]
+    if args.destinos:
+        # Poucos fins compartilhados: o agente i vai para o fim i % destinos
+        pontos = simulacao.rng.sample(livres, min(args.agentes + args.destinos, len(livres)))
+        inicios, fins = pontos[args.destinos:], pontos[:args.destinos]
+        for i, pos in enumerate(inicios):
+            grid.adicionar_ponto(pos)
+            grid.adicionar_ponto(fins[i % len(fins)])
+    else:
+        pontos = simulacao.rng.sample(livres, min(2 * args.agentes, len(livres) - len(livres) % 2))
+        for pos in pontos:
+            grid.adicionar_ponto(pos)
+
+    inicio = time.perf_counter()
+    with open(os.devnull, 'w') as nulo, (nullcontext() if args.verboso else redirect_stdout(nulo)):
+        simulacao.criar_agentes()
+        criacao = time.perf_counter() - inicio
+        criados = len(simulacao.agentes_ativos)
+        passos = simulacao.executar(args.ticks)
+    duracao = time.perf_counter() - inicio
+    print(f"{passos} passos ({simulacao.tempo / 1000:.1f} s simulados) em {duracao:.2f} s "
+          f"(criação dos agentes: {criacao * 1000:.1f} ms). "
+          f"Agentes: {criados} criados, {simulacao.chegaram} chegaram, {simulacao.morreram} morreram, "
+          f"{len(simulacao.agentes_ativos)} ainda ativos.")
+    for nome, pathfinder in (("criação", simulacao.pathfinder), ("evasão", grid.pathfinder_ia)):
+        if hasattr(pathfinder, "estatisticas"): # Só o CacheCaminhos (CACHE_CAMINHOS > 0)
+            e = pathfinder.estatisticas()
+            print(f"Cache de caminhos ({nome}): {e['acertos']} acertos, {e['falhas']} falhas "
+                  f"({e['taxa_acertos']:.0%}), {e['entradas']} entradas.")
+
+
+if __name__ == "__main__":
+    main()
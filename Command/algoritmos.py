@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
-from collections import deque
+from array import array
+from collections import OrderedDict
+import heapq
 from config import CONFIG # Precisa do GRID_RESOLUCAO
 
 # ==========================================
@@ -11,29 +13,379 @@ class IPathfinder(ABC):
     def encontrar_caminho(self, inicio, fim, obstaculos_set, resolucao):
         pass
 
+# ==========================================
+# Núcleo de busca com ids inteiros
+# ==========================================
+# As células viram ids (id = lin * resolucao + col) e os dados da busca ficam em
+# buffers pré-alocados, reaproveitados entre chamadas. `visitado` guarda a geração
+# da busca que marcou a célula, então não precisa ser zerado a cada busca.
+
+class NucleoIds:
+    def __init__(self, resolucao):
+        n = resolucao * resolucao
+        self.resolucao = resolucao
+        self.pai = array('i', bytes(4 * n))
+        self.custo = array('i', bytes(4 * n))
+        self.visitado = array('I', bytes(4 * n))
+        self.fechado = array('I', bytes(4 * n))
+        self.fila = array('i', bytes(4 * n)) # Cada célula entra no máximo uma vez na BFS
+        self.bloqueado = bytearray(n)
+        self._obstaculos_carregados = frozenset() # Conteúdo atual de bloqueado
+        self.versao_bloqueado = 0 # Muda a cada recarga (chave das tabelas derivadas de bloqueado)
+        self.geracao = 0
+        self.expandidos = 0 # Células expandidas pelo último A*
+
+    def carregar_obstaculos(self, obstaculos_set):
+        """
+        Preenche self.bloqueado e o devolve. O conteúdo carregado fica guardado
+        (frozenset): com os mesmos obstáculos a grade não é tocada, e com outros
+        só as células que entraram ou saíram são trocadas.
+        """
+        carregados = self._obstaculos_carregados
+        if len(carregados) == len(obstaculos_set) and carregados == obstaculos_set:
+            return self.bloqueado
+        novos = frozenset(obstaculos_set)
+        self._obstaculos_carregados = novos
+        self.versao_bloqueado += 1
+
+        R = self.resolucao
+        bloqueado = self.bloqueado
+        for lin, col in carregados - novos:
+            bloqueado[lin * R + col] = 0
+        for lin, col in novos - carregados:
+            bloqueado[lin * R + col] = 1
+        return bloqueado
+
+    def nova_geracao(self):
+        self.geracao += 1
+        if self.geracao == 0xFFFFFFFF: # Estouro do contador: zera as marcas
+            self.visitado = array('I', bytes(len(self.visitado) * 4))
+            self.fechado = array('I', bytes(len(self.fechado) * 4))
+            self.geracao = 1
+        return self.geracao
+
+    def bfs(self, origem, destino, primeiro, vizinhos):
+        """BFS de origem até destino; os predecessores ficam em self.pai. Retorna True se achou."""
+        pai, visitado, fila, bloqueado = self.pai, self.visitado, self.fila, self.bloqueado
+        g = self.nova_geracao()
+        visitado[origem] = g
+        pai[origem] = origem
+        fila[0] = origem
+        cabeca, cauda = 0, 1
+        while cabeca < cauda:
+            atual = fila[cabeca]
+            cabeca += 1
+            if atual == destino:
+                return True
+            for k in range(primeiro[atual], primeiro[atual + 1]):
+                vizinho = vizinhos[k]
+                if visitado[vizinho] != g and not bloqueado[vizinho]:
+                    visitado[vizinho] = g
+                    pai[vizinho] = atual
+                    fila[cauda] = vizinho
+                    cauda += 1
+        return False
+
+    def astar(self, origem, destino, primeiro, vizinhos, h):
+        """
+        A* com heapq sobre ids; h(id) é a heurística até o destino. Retorna True
+        se achou; o número de células expandidas fica em self.expandidos.
+        """
+        pai, custo, visitado, fechado, bloqueado = self.pai, self.custo, self.visitado, self.fechado, self.bloqueado
+        g = self.nova_geracao()
+        visitado[origem] = g
+        custo[origem] = 0
+        pai[origem] = origem
+
+        # Itens da fila: (f, h, contador, id). Empate em f favorece quem está
+        # mais perto do fim; o contador mantém a ordem de inserção nos empates.
+        contador = 0
+        fila = [(h(origem), 0, contador, origem)]
+        self.expandidos = 0
+        while fila:
+            _, _, _, atual = heapq.heappop(fila)
+            if fechado[atual] == g:
+                continue # Entrada antiga, a célula já saiu com custo menor
+            fechado[atual] = g
+            self.expandidos += 1
+            if atual == destino:
+                return True
+
+            novo_custo = custo[atual] + 1
+            for k in range(primeiro[atual], primeiro[atual + 1]):
+                vizinho = vizinhos[k]
+                if bloqueado[vizinho] or fechado[vizinho] == g:
+                    continue
+                if visitado[vizinho] != g or novo_custo < custo[vizinho]:
+                    visitado[vizinho] = g
+                    custo[vizinho] = novo_custo
+                    pai[vizinho] = atual
+                    h_vizinho = h(vizinho)
+                    contador += 1
+                    heapq.heappush(fila, (novo_custo + h_vizinho, h_vizinho, contador, vizinho))
+        return False
+
+    def caminho(self, destino):
+        """Converte a cadeia de predecessores de volta para tuplas (lin, col)."""
+        pai = self.pai
+        ids = [destino]
+        while pai[ids[-1]] != ids[-1]:
+            ids.append(pai[ids[-1]])
+        return [divmod(i, self.resolucao) for i in reversed(ids)]
+
+
+_nucleos = {} # resolucao -> NucleoIds
+
+def obter_nucleo(resolucao):
+    if resolucao not in _nucleos:
+        _nucleos[resolucao] = NucleoIds(resolucao)
+    return _nucleos[resolucao]
+
 class BFSAlgoritmo(IPathfinder):
-    """Implementação do BFS que usa o Adapter da GridSystem para obter vizinhos."""
+    """Implementação do BFS que usa a tabela de vizinhos do Adapter (via GridSystem)."""
     def encontrar_caminho(self, inicio, fim, obstaculos_set, resolucao):
 
         from grid_system import GridSystem # Para obter a vizinhança
         # Obtém a instância única do GridSystem
         grid_singleton = GridSystem.getInstance() 
 
-        filas = deque([(inicio, [inicio])])
-        visitados = {inicio}
-        
-        while filas:
-            atual, caminho = filas.popleft()
+        # Vizinhança pré-calculada pelo Adapter: células viram ids inteiros
+        primeiro, vizinhos = grid_singleton.tabela_vizinhos()
+        nucleo = obter_nucleo(resolucao)
+        nucleo.carregar_obstaculos(obstaculos_set)
+        destino = fim[0] * resolucao + fim[1]
+        if nucleo.bfs(inicio[0] * resolucao + inicio[1], destino, primeiro, vizinhos):
+            return nucleo.caminho(destino)
+        return None
+
+class AStarAlgoritmo(IPathfinder):
+    """
+    A* com fila de prioridade (heapq). A heurística padrão é a distância da
+    geometria atual (Manhattan no Retangular, distância hexagonal no Hexagonal),
+    obtida do Adapter através do Singleton. Outra heurística pode ser passada
+    como função h(celula, fim).
+    """
+    def __init__(self, heuristica=None):
+        self.heuristica = heuristica
+        self.nos_expandidos = 0 # Células retiradas da fila na última busca
+
+    def encontrar_caminho(self, inicio, fim, obstaculos_set, resolucao):
+
+        from grid_system import GridSystem
+        grid_singleton = GridSystem.getInstance()
+        distancia = self.heuristica or grid_singleton.distancia
+
+        primeiro, vizinhos = grid_singleton.tabela_vizinhos()
+        nucleo = obter_nucleo(resolucao)
+        nucleo.carregar_obstaculos(obstaculos_set)
+        destino = fim[0] * resolucao + fim[1]
+        achou = nucleo.astar(inicio[0] * resolucao + inicio[1], destino, primeiro, vizinhos,
+                             lambda i: distancia(divmod(i, resolucao), fim))
+        self.nos_expandidos = nucleo.expandidos
+        return nucleo.caminho(destino) if achou else None
+
+_BITS = bytes.maketrans(b'\x00\x01', b'01') # bytearray de 0/1 -> texto binário
+
+class JPSAlgoritmo(IPathfinder):
+    """
+    Jump Point Search para grids retangulares de 4 direções (custo uniforme).
+    Movimentos verticais fazem o papel da diagonal do JPS clássico: a cada passo
+    vertical a busca olha a linha para os dois lados. Movimentos horizontais só
+    param no fim ou em vizinhos forçados (célula acima/abaixo livre com a célula
+    anterior dela bloqueada). Só os pontos de salto entram na fila do A*.
+    Os saltos horizontais saem de máscaras de bits por linha (paredes e vizinhos
+    forçados), então cada passo vertical custa O(1) em vez de O(R).
+    """
+    def __init__(self):
+        self.nos_expandidos = 0 # Pontos de salto retirados da fila na última busca
+        self._chave_mascaras = None
+        self._mascaras = None
+
+    def _mascaras_linhas(self, nucleo):
+        """
+        Uma máscara de bits por linha (bit col = célula bloqueada) e, para cada
+        sentido dc (1 ou -1), a máscara dos vizinhos forçados de cada linha.
+        Refeitas quando nucleo.bloqueado é recarregado.
+        """
+        chave = (nucleo, nucleo.versao_bloqueado)
+        if self._chave_mascaras == chave:
+            return self._mascaras
+        R, bloqueado = nucleo.resolucao, nucleo.bloqueado
+        todos = (1 << R) - 1
+        paredes = [int(bytes(bloqueado[lin * R:(lin + 1) * R])[::-1].translate(_BITS), 2) for lin in range(R)]
+
+        forcados = {}
+        for dc in (1, -1):
+            # Célula de trás (col - dc) bloqueada; fora do grid conta como bloqueada
+            atras = [((m << 1) | 1) & todos if dc == 1 else (m >> 1) | (1 << (R - 1)) for m in paredes]
+            linhas = []
+            for lin in range(R):
+                mascara = 0
+                for v in (lin - 1, lin + 1):
+                    if 0 <= v < R:
+                        mascara |= ~paredes[v] & atras[v]
+                linhas.append(mascara & ~paredes[lin])
+            forcados[dc] = linhas
+        self._chave_mascaras, self._mascaras = chave, (paredes, forcados)
+        return self._mascaras
+
+    def encontrar_caminho(self, inicio, fim, obstaculos_set, resolucao):
+
+        from grid_system import GridSystem
+        grid_singleton = GridSystem.getInstance()
+        if grid_singleton.geometria != "RETANGULAR":
+            # JPS só vale para a vizinhança de 4 direções; no Hexagonal usa o A*
+            return AStarAlgoritmo().encontrar_caminho(inicio, fim, obstaculos_set, resolucao)
+
+        nucleo = obter_nucleo(resolucao)
+        bloqueado = nucleo.carregar_obstaculos(obstaculos_set)
+
+        def livre(lin, col):
+            return 0 <= lin < resolucao and 0 <= col < resolucao and not bloqueado[lin * resolucao + col]
+
+        def forcado(lin, col, dc):
+            # Vizinhos verticais que só são alcançados de forma ótima virando aqui
+            return [dl for dl in (-1, 1) if livre(lin + dl, col) and not livre(lin + dl, col - dc)]
+
+        paredes, forcados = self._mascaras_linhas(nucleo)
+
+        def saltar_horizontal(lin, col, dc):
+            # Primeira parede (limite) e primeiro vizinho forçado (alvo) à frente de col
+            parede, forcado_linha = paredes[lin], forcados[dc][lin]
+            if dc == 1:
+                frente = parede >> (col + 1)
+                limite = col + (frente & -frente).bit_length() if frente else resolucao
+                frente = forcado_linha >> (col + 1)
+                alvo = col + (frente & -frente).bit_length() if frente else resolucao
+            else:
+                antes = (1 << col) - 1
+                limite = (parede & antes).bit_length() - 1
+                alvo = (forcado_linha & antes).bit_length() - 1
+            if lin == fim[0] and 0 < (fim[1] - col) * dc < (limite - col) * dc and (fim[1] - alvo) * dc <= 0:
+                return fim # O fim vem antes da parede e do vizinho forçado
+            return (lin, alvo) if (alvo - limite) * dc < 0 else None
+
+        def saltar_vertical(lin, col, dl):
+            while True:
+                lin += dl
+                if not livre(lin, col):
+                    return None
+                if ((lin, col) == fim or saltar_horizontal(lin, col, 1)
+                        or saltar_horizontal(lin, col, -1)):
+                    return (lin, col)
+
+        def h(celula):
+            return abs(celula[0] - fim[0]) + abs(celula[1] - fim[1])
+
+        # Itens da fila: (f, h, contador, célula, direção de chegada)
+        contador = 0
+        fila = [(h(inicio), 0, contador, inicio, None)]
+        custo = {inicio: 0}
+        pai = {inicio: None}
+        fechados = set()
+        self.nos_expandidos = 0
+
+        while fila:
+            _, _, _, atual, direcao = heapq.heappop(fila)
+            if atual in fechados:
+                continue
+            fechados.add(atual)
+            self.nos_expandidos += 1
+
             if atual == fim:
-                return caminho
-            
+                return self._expandir_caminho(atual, pai)
+
             lin, col = atual
-            
-            # CHAMA O ADAPTER através do Singleton
-            vizinhos = grid_singleton.obter_vizinhos(lin, col) 
-            
-            for vizinho in vizinhos:
-                if vizinho not in visitados and vizinho not in obstaculos_set:
-                    visitados.add(vizinho)
-                    filas.append((vizinho, caminho + [vizinho]))
-        return None
\ No newline at end of file
+            if direcao is None: # Início: todas as direções
+                direcoes = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+            elif direcao[0] != 0: # Chegou na vertical: segue e abre a linha
+                direcoes = [direcao, (0, 1), (0, -1)]
+            else: # Chegou na horizontal: segue e vira só para os vizinhos forçados
+                direcoes = [direcao] + [(dl, 0) for dl in forcado(lin, col, direcao[1])]
+
+            for dl, dc in direcoes:
+                if dl:
+                    ponto = saltar_vertical(lin, col, dl)
+                else:
+                    ponto = saltar_horizontal(lin, col, dc)
+                if ponto is None or ponto in fechados:
+                    continue
+                novo_custo = custo[atual] + abs(ponto[0] - lin) + abs(ponto[1] - col)
+                if novo_custo < custo.get(ponto, novo_custo + 1):
+                    custo[ponto] = novo_custo
+                    pai[ponto] = atual
+                    h_ponto = h(ponto)
+                    contador += 1
+                    heapq.heappush(fila, (novo_custo + h_ponto, h_ponto, contador, ponto, (dl, dc)))
+        return None
+
+    @staticmethod
+    def _expandir_caminho(atual, pai):
+        # Pontos de salto consecutivos estão na mesma linha ou coluna:
+        # preenche as células entre eles
+        caminho = [atual]
+        while pai[atual] is not None:
+            anterior = pai[atual]
+            dl = (anterior[0] > atual[0]) - (anterior[0] < atual[0])
+            dc = (anterior[1] > atual[1]) - (anterior[1] < atual[1])
+            while atual != anterior:
+                atual = (atual[0] + dl, atual[1] + dc)
+                caminho.append(atual)
+        return caminho[::-1]
+
+
+class CacheCaminhos(IPathfinder):
+    """
+    Proxy com cache LRU na frente de outra estratégia. A chave é
+    (versão do layout, início, fim): os obstáculos passados devem ser os do
+    GridSystem, que incrementa versao_layout a cada alteração. Os contadores
+    da última busca (nos_expandidos, custo_total) são guardados com cada
+    entrada; num acerto nenhum nó é expandido.
+    """
+    ESTATISTICAS_BUSCA = ("nos_expandidos", "custo_total")
+
+    def __init__(self, estrategia, capacidade=256):
+        self.estrategia = estrategia
+        self.capacidade = capacidade
+        self._cache = OrderedDict()
+        self._versao = None
+        self.acertos = 0
+        self.falhas = 0
+
+    def __getattr__(self, nome):
+        # Outros atributos da estratégia continuam acessíveis
+        return getattr(self.estrategia, nome)
+
+    def estatisticas(self):
+        consultas = self.acertos + self.falhas
+        return {
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+            "taxa_acertos": self.acertos / consultas if consultas else 0.0,
+            "entradas": len(self._cache),
+        }
+
+    def encontrar_caminho(self, inicio, fim, obstaculos_set, resolucao):
+        from grid_system import GridSystem
+        versao = GridSystem.getInstance().versao_layout
+        if versao != self._versao: # Layout mudou: nenhuma entrada antiga serve mais
+            self._cache.clear()
+            self._versao = versao
+
+        chave = (inicio, fim)
+        if chave in self._cache:
+            self._cache.move_to_end(chave)
+            self.acertos += 1
+            caminho, busca = self._cache[chave]
+            if "nos_expandidos" in busca:
+                busca = dict(busca, nos_expandidos=0) # Acerto: nenhum nó expandido nesta consulta
+        else:
+            self.falhas += 1
+            caminho = self.estrategia.encontrar_caminho(inicio, fim, obstaculos_set, resolucao)
+            busca = {nome: getattr(self.estrategia, nome) for nome in self.ESTATISTICAS_BUSCA
+                     if hasattr(self.estrategia, nome)}
+            self._cache[chave] = (caminho, busca)
+            if len(self._cache) > self.capacidade:
+                self._cache.popitem(last=False)
+        self.__dict__.update(busca) # Contadores desta consulta, não da busca anterior da estratégia
+        return list(caminho) if caminho else caminho # Cópia: quem chama pode alterar a lista
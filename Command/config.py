@@ -3,6 +3,8 @@ CONFIG = {
     "LARGURA_TELA": 760,
     "ALTURA_TELA": 700,
     "GRID_RESOLUCAO": 20,
+    "ALGORITMO": "BFS_SIMPLES", # "BFS_SIMPLES", "ASTAR" ou "JPS" (ver AlgoritmoFactory)
+    "CACHE_CAMINHOS": 0, # Caminhos guardados no cache LRU (0 = sem cache; ex.: 256)
     "NUM_FOGO": 5,        # Quantidade de fogos aleatórios
     "VIDA_INICIAL": 4,    # Vida do agente
     "DANO_FOGO": 1,       # Dano ao tentar entrar no fogo
@@ -29,7 +29,7 @@ class GameEngine(Observer): # GameEngine observa o Agente
         # --- Configuração do Jogo ---
         self.modo = "OBSTACULOS"
         self.rodando = True
-        self.pathfinder = AlgoritmoFactory.get_algoritmo("BFS_SIMPLES")
+        self.pathfinder = AlgoritmoFactory.get_algoritmo(CONFIG["ALGORITMO"], CONFIG["CACHE_CAMINHOS"])
         
         # --- PADRÃO COMMAND (Gerenciador) ---
         self.command_manager = CommandManager()
@@ -140,6 +140,9 @@ class GameEngine(Observer): # GameEngine observa o Agente
             if caminho:
                 cor = tuple(random.randint(50, 255) for _ in range(3))
                 self.grid.caminhos.append((caminho, cor))
+        if hasattr(self.pathfinder, "estatisticas"): # Só o CacheCaminhos (CACHE_CAMINHOS > 0)
+            e = self.pathfinder.estatisticas()
+            print(f"Cache de caminhos: {e['acertos']} acertos, {e['falhas']} falhas ({e['taxa_acertos']:.0%})")
 
     def desenhar(self):
         self.tela.fill(CONFIG["CORES"]["BRANCO"])
@@ -25,6 +25,7 @@ class GridSystem:
         self.largura_tela, self.altura_tela = tela_size
         self.resolucao = CONFIG["GRID_RESOLUCAO"]
         self.obstaculos = {}
+        self.versao_layout = 0 # Muda a cada alteração nos obstáculos (chave do cache de caminhos)
         self.pontos_inicio = []
         self.pontos_fim = []
         self.caminhos = []
@@ -62,6 +63,12 @@ class GridSystem:
     def obter_vizinhos(self, lin, col):
         return self.geometria_adapter.obter_vizinhos(lin, col, self.resolucao)
 
+    def distancia(self, a, b):
+        return self.geometria_adapter.distancia(a, b)
+
+    def tabela_vizinhos(self):
+        return self.geometria_adapter.tabela_vizinhos(self.resolucao)
+
     def pixel_para_grid(self, pos_pixel):
         if not self.rect_area.collidepoint(pos_pixel):
             return None
@@ -158,6 +165,7 @@ class GridSystem:
             del self.obstaculos[pos]
         else:
             self.obstaculos[pos] = ObstaculoFactory.criar("PAREDE", pos)
+        self.versao_layout += 1
 
     def adicionar_ponto(self, pos):
         if pos in self.obstaculos: return
@@ -168,6 +176,7 @@ class GridSystem:
 
     def limpar(self):
         self.obstaculos.clear()
+        self.versao_layout += 1
         self.pontos_inicio.clear()
         self.pontos_fim.clear()
         self.caminhos.clear()
@@ -196,6 +205,7 @@ class GridSystem:
                 fogo = ComportamentoFogoDecorator(parede)
                 self.obstaculos[pos] = fogo
                 count_fogo += 1
+        self.versao_layout += 1 # Fogos entram direto no dicionário
 
         '''# 3. Pontos (Início/Fim)
         for _ in range(n_pares):
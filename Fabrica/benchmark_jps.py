@@ -0,0 +1,65 @@
+import argparse
+import random
+import time
+from algoritmos import AStarAlgoritmo, JPSAlgoritmo, obter_nucleo
+
+# ----------------------------
+# Tempo do JPS contra o A* (sem pygame)
+# ----------------------------
+# Para cada resolução e densidade, sorteia um mapa e pares de pontos com semente
+# fixa e mede as buscas com time.perf_counter_ns(). A primeira consulta de cada
+# mapa (que monta a vizinhança do A* e as máscaras de linha do JPS) é medida à
+# parte como "preparação". Também confere que os dois caminhos têm o mesmo tamanho.
+#
+# Exemplo:
+#   python benchmark_jps.py --resolucoes 100 500 --densidades 0 0.2
+
+
+def sortear_mapa(resolucao, densidade, pares, semente):
+    rng = random.Random(semente)
+    obstaculos = {(rng.randrange(resolucao), rng.randrange(resolucao))
+                  for _ in range(int(resolucao * resolucao * densidade))}
+    livres = [(lin, col) for lin in range(resolucao) for col in range(resolucao) if (lin, col) not in obstaculos]
+    return obstaculos, [tuple(rng.sample(livres, 2)) for _ in range(pares)]
+
+
+def medir(algoritmo, obstaculos, pontos, resolucao):
+    t0 = time.perf_counter_ns()
+    algoritmo.encontrar_caminho(pontos[0][0], pontos[0][1], obstaculos, resolucao)
+    preparacao = time.perf_counter_ns() - t0
+
+    tempos, caminhos, expandidos = [], [], 0
+    for inicio, fim in pontos:
+        t0 = time.perf_counter_ns()
+        caminho = algoritmo.encontrar_caminho(inicio, fim, obstaculos, resolucao)
+        tempos.append(time.perf_counter_ns() - t0)
+        caminhos.append(len(caminho) if caminho else None)
+        expandidos += algoritmo.nos_expandidos
+    tempos.sort()
+    return preparacao, tempos[len(tempos) // 2], expandidos, caminhos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tempo do JPS contra o A*")
+    parser.add_argument("--resolucoes", type=int, nargs="+", default=[100, 250, 500])
+    parser.add_argument("--densidades", type=float, nargs="+", default=[0.0, 0.2])
+    parser.add_argument("--pares", type=int, default=20)
+    parser.add_argument("--semente", type=int, default=0)
+    args = parser.parse_args()
+
+    for resolucao in args.resolucoes:
+        for densidade in args.densidades:
+            obstaculos, pontos = sortear_mapa(resolucao, densidade, args.pares, args.semente)
+            resultados = {}
+            for nome, algoritmo in (("ASTAR", AStarAlgoritmo()), ("JPS", JPSAlgoritmo())):
+                obter_nucleo(resolucao).carregar_obstaculos(set()) # Cada algoritmo recarrega o mapa
+                resultados[nome] = medir(algoritmo, set(obstaculos), pontos, resolucao)
+            if resultados["ASTAR"][3] != resultados["JPS"][3]:
+                raise AssertionError(f"JPS e A* deram caminhos de tamanhos diferentes (R={resolucao}, densidade={densidade})")
+            for nome, (preparacao, mediana, expandidos, _) in resultados.items():
+                print(f"R={resolucao} | densidade={densidade:.2f} | {nome:5} | preparação: {preparacao / 1e6:8.2f} ms"
+                      f" | busca (mediana): {mediana / 1e6:8.3f} ms | nós expandidos: {expandidos}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@ CONFIG = {
     "LARGURA_TELA": 800,
     "ALTURA_TELA": 600,
     "GRID_RESOLUCAO": 20,
+    "ALGORITMO": "BFS_SIMPLES", # "BFS_SIMPLES", "ASTAR" ou "JPS" (ver AlgoritmoFactory)
     "CORES": {
         "BRANCO": (255, 255, 255),
         "PRETO": (0, 0, 0),
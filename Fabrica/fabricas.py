@@ -1,5 +1,5 @@
 from entidades import ObstaculoParede, PontoInicio, PontoFim # Importa os produtos
-from algoritmos import BFSAlgoritmo # Importa o algoritmo
+from algoritmos import BFSAlgoritmo, AStarAlgoritmo, JPSAlgoritmo # Importa os algoritmos
 
 # ==========================================
 # 3. FÁBRICAS (Factory Method)
@@ -27,6 +27,9 @@ class AlgoritmoFactory:
     def get_algoritmo(tipo="BFS_SIMPLES"):
         if tipo == "BFS_SIMPLES":
             return BFSAlgoritmo()
+        elif tipo == "ASTAR":
+            return AStarAlgoritmo()
+        elif tipo == "JPS": # Só grids retangulares
+            return JPSAlgoritmo()
         # Futuro: elif tipo == "DIAGONAL": return BFSDiagonal()
-        # Futuro: elif tipo == "ASTAR": return AStarAlgoritmo()
         return BFSAlgoritmo()
\ No newline at end of file
@@ -21,7 +21,7 @@ class GameEngine:
         self.rodando = True
         
         # Instancia o algoritmo via Fábrica
-        self.pathfinder = AlgoritmoFactory.get_algoritmo("BFS_SIMPLES")
+        self.pathfinder = AlgoritmoFactory.get_algoritmo(CONFIG["ALGORITMO"])
 
     def processar_eventos(self):
         for evento in pygame.event.get():
@@ -0,0 +1,444 @@
+from collections import deque
+
+# NumPy só é necessário para a frente de onda (modo WAVEFRONT)
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DIRECOES = [(1,0), (-1,0), (0,1), (0,-1)]
+
+# Contadores da última busca (e acumulado), para medir quantos nós cada modo visita
+estatisticas = {"visitados": 0, "visitados_total": 0}
+
+def registrar_visitados(n):
+    estatisticas["visitados"] = n
+    estatisticas["visitados_total"] += n
+
+# ----------------------------
+# Grade de ocupação plana
+# ----------------------------
+# Cada célula é identificada por um índice plano (lin * GRID_RESOLUCAO + col),
+# e a grade guarda 1 byte por célula (1 = obstáculo).
+
+def mapa_ocupacao(obstaculos, GRID_RESOLUCAO):
+    if isinstance(obstaculos, (bytes, bytearray)):
+        return obstaculos
+    grade = bytearray(GRID_RESOLUCAO * GRID_RESOLUCAO)
+    for lin, col in obstaculos:
+        grade[lin * GRID_RESOLUCAO + col] = 1
+    return grade
+
+# ----------------------------
+# Componentes conexas
+# ----------------------------
+# Cada célula livre recebe o rótulo da sua região. Dois pontos com rótulos
+# diferentes não têm caminho, e isso é respondido em O(1) sem inundar a região
+# inteira com uma BFS. Ao alternar um único obstáculo, só a região afetada é
+# rotulada de novo.
+
+class ComponentesConexos:
+    def __init__(self, bloqueado, GRID_RESOLUCAO):
+        self.bloqueado = bloqueado # Mesma grade usada pelas buscas (alterada por fora)
+        self.R = GRID_RESOLUCAO
+        self.recalcular()
+
+    def recalcular(self):
+        self.rotulo = [-1] * (self.R * self.R) # -1 = obstáculo
+        self.tamanho = {}
+        self.proximo_rotulo = 0
+        for i in range(self.R * self.R):
+            if not self.bloqueado[i] and self.rotulo[i] == -1:
+                rotulo = self._novo_rotulo()
+                self.tamanho[rotulo] = self._inundar(i, rotulo)
+
+    def _novo_rotulo(self):
+        self.proximo_rotulo += 1
+        return self.proximo_rotulo
+
+    def _vizinhos(self, i):
+        R = self.R
+        lin, col = divmod(i, R)
+        for dl, dc in DIRECOES:
+            nl, nc = lin + dl, col + dc
+            if 0 <= nl < R and 0 <= nc < R:
+                yield nl * R + nc
+
+    # Espalha `rotulo` pela região livre que contém `inicio` (parando nas células
+    # que já têm esse rótulo) e retorna quantas células foram rotuladas
+    def _inundar(self, inicio, rotulo):
+        self.rotulo[inicio] = rotulo
+        fila = deque([inicio])
+        total = 1
+        while fila:
+            atual = fila.popleft()
+            for vizinho in self._vizinhos(atual):
+                if not self.bloqueado[vizinho] and self.rotulo[vizinho] != rotulo:
+                    self.rotulo[vizinho] = rotulo
+                    total += 1
+                    fila.append(vizinho)
+        return total
+
+    # Chamar depois que a célula `cel` mudou na grade `bloqueado`
+    def atualizar(self, cel):
+        i = cel[0] * self.R + cel[1]
+        vizinhos_livres = [v for v in self._vizinhos(i) if not self.bloqueado[v]]
+
+        if self.bloqueado[i]:
+            # Virou obstáculo: a região pode ter se partido em até 4 pedaços
+            antigo = self.rotulo[i]
+            self.rotulo[i] = -1
+            if antigo == -1:
+                return
+            self.tamanho[antigo] -= 1
+            if len(vizinhos_livres) < 2:
+                if self.tamanho[antigo] == 0:
+                    del self.tamanho[antigo]
+                return
+            del self.tamanho[antigo]
+            novos = set()
+            for v in vizinhos_livres:
+                if self.rotulo[v] not in novos:
+                    rotulo = self._novo_rotulo()
+                    self.tamanho[rotulo] = self._inundar(v, rotulo)
+                    novos.add(rotulo)
+        else:
+            # Virou livre: junta as regiões vizinhas (as menores recebem o rótulo da maior)
+            if self.rotulo[i] != -1:
+                return
+            rotulos = {self.rotulo[v] for v in vizinhos_livres}
+            if not rotulos:
+                rotulo = self._novo_rotulo()
+                self.rotulo[i] = rotulo
+                self.tamanho[rotulo] = 1
+                return
+            maior = max(rotulos, key=lambda r: self.tamanho[r])
+            self.rotulo[i] = maior
+            self.tamanho[maior] += 1
+            for v in vizinhos_livres:
+                menor = self.rotulo[v]
+                if menor != maior:
+                    del self.tamanho[menor]
+                    self.tamanho[maior] += self._inundar(v, maior)
+
+    # False somente quando com certeza não existe caminho entre as duas células.
+    # O início pode estar sobre um obstáculo (a BFS aceita); nesse caso vale o rótulo dos vizinhos.
+    def conectados(self, inicio, fim):
+        if inicio == fim:
+            return True
+        i = inicio[0] * self.R + inicio[1]
+        rotulo_fim = self.rotulo[fim[0] * self.R + fim[1]]
+        if rotulo_fim == -1:
+            return False
+        if self.rotulo[i] != -1:
+            return self.rotulo[i] == rotulo_fim
+        return any(self.rotulo[v] == rotulo_fim for v in self._vizinhos(i))
+
+# ----------------------------
+# BFS com lista de predecessores
+# ----------------------------
+# Em vez de guardar uma cópia do caminho em cada entrada da fila, guardamos apenas
+# o predecessor de cada célula em uma lista plana: O(R^2) de memória por busca.
+
+# Vizinhos de cada célula (índices planos dentro do grid), calculados uma vez por
+# resolução: a BFS não refaz divmod nem testes de borda a cada célula retirada da fila.
+_tabelas_vizinhos = {}
+
+def tabela_vizinhos(GRID_RESOLUCAO):
+    R = GRID_RESOLUCAO
+    if R not in _tabelas_vizinhos:
+        tabela = []
+        for i in range(R * R):
+            lin, col = divmod(i, R)
+            tabela.append(tuple(nl * R + nc for nl, nc in ((lin + dl, col + dc) for dl, dc in DIRECOES)
+                                if 0 <= nl < R and 0 <= nc < R))
+        _tabelas_vizinhos[R] = tabela
+    return _tabelas_vizinhos[R]
+
+# Retorna a lista de predecessores (-1 = não alcançada). Para assim que todos
+# os destinos pedidos forem retirados da fila.
+def bfs_predecessores(origem, destinos, bloqueado, GRID_RESOLUCAO):
+    R = GRID_RESOLUCAO
+    vizinhos = tabela_vizinhos(R)
+    pai = [-1] * (R * R) # -1 = ainda não visitado
+    pai[origem] = origem
+    faltam = set(destinos)
+    fila = [origem] # A lista cresce enquanto é percorrida (fila sem popleft)
+    for atual in fila:
+        if atual in faltam:
+            faltam.discard(atual)
+            if not faltam:
+                break
+        for vizinho in vizinhos[atual]:
+            if pai[vizinho] == -1 and not bloqueado[vizinho]:
+                pai[vizinho] = atual
+                fila.append(vizinho)
+    registrar_visitados(len(fila))
+    return pai
+
+# Reconstrói [inicio, ..., fim] seguindo os predecessores a partir do fim
+def reconstruir_caminho(pai, origem, destino, GRID_RESOLUCAO):
+    caminho = []
+    atual = destino
+    while atual != origem:
+        caminho.append(divmod(atual, GRID_RESOLUCAO))
+        atual = pai[atual]
+    caminho.append(divmod(origem, GRID_RESOLUCAO))
+    caminho.reverse()
+    return caminho
+
+# Cada modo de busca é dividido em duas fases, para poderem ser medidas em separado:
+#   busca_X(inicio, fim, grade, GRID_RESOLUCAO) -> estado (ou None se não há caminho)
+#   reconstruir_X(estado, inicio, fim, GRID_RESOLUCAO) -> [inicio, ..., fim]
+
+def busca_bfs(inicio, fim, bloqueado, GRID_RESOLUCAO):
+    R = GRID_RESOLUCAO
+    destino = fim[0] * R + fim[1]
+    pai = bfs_predecessores(inicio[0] * R + inicio[1], {destino}, bloqueado, R)
+    if pai[destino] == -1:
+        return None
+    return pai
+
+def reconstruir_bfs(pai, inicio, fim, GRID_RESOLUCAO):
+    R = GRID_RESOLUCAO
+    return reconstruir_caminho(pai, inicio[0] * R + inicio[1], fim[0] * R + fim[1], R)
+
+def menor_caminho_bfs(inicio, fim, bloqueado, GRID_RESOLUCAO):
+    pai = busca_bfs(inicio, fim, bloqueado, GRID_RESOLUCAO)
+    if pai is None:
+        return None
+    return reconstruir_bfs(pai, inicio, fim, GRID_RESOLUCAO)
+
+# Roteamento em lote: agrupa os pares pela célula de início; uma única varredura
+# BFS por origem distinta serve todos os destinos daquele grupo, e a busca só para
+# quando o último destino do grupo é alcançado. Os pares que ficaram sozinhos no
+# seu início mas dividem o fim com outros são agrupados pelo fim: a BFS parte do
+# fim (o grid é não dirigido) e o caminho é invertido. Com todos os pontos
+# distintos (como em gerar_cenario) cada grupo tem um par só, e o ganho vem da
+# tabela de vizinhos da BFS. Retorna (caminho, predecessores) por par.
+def caminhos_em_lote(pares, bloqueado, GRID_RESOLUCAO):
+    R = GRID_RESOLUCAO
+    por_inicio, por_fim = {}, {}
+    for i, (inicio, fim) in enumerate(pares):
+        por_inicio.setdefault(inicio, []).append(i)
+    for inicio, indices in list(por_inicio.items()):
+        fim = pares[indices[0]][1]
+        # A BFS aceita início sobre obstáculo, mas não fim: a inversão só vale com os dois livres
+        if len(indices) == 1 and not bloqueado[inicio[0] * R + inicio[1]] and not bloqueado[fim[0] * R + fim[1]]:
+            por_fim.setdefault(fim, []).append(indices[0])
+    for fim, indices in list(por_fim.items()):
+        if len(indices) > 1:
+            for i in indices:
+                del por_inicio[pares[i][0]]
+        else:
+            del por_fim[fim]
+
+    resultado = [(None, None)] * len(pares)
+    for grupos, ponta, invertido in ((por_inicio, 0, False), (por_fim, 1, True)):
+        for celula, indices in grupos.items():
+            origem = celula[0] * R + celula[1]
+            destinos = {pares[i][1 - ponta][0] * R + pares[i][1 - ponta][1] for i in indices}
+            pai = bfs_predecessores(origem, destinos, bloqueado, R)
+            for i in indices:
+                outra = pares[i][1 - ponta]
+                destino = outra[0] * R + outra[1]
+                caminho = None
+                if pai[destino] != -1:
+                    caminho = reconstruir_caminho(pai, origem, destino, R)
+                    if invertido:
+                        caminho.reverse()
+                resultado[i] = (caminho, pai)
+    return resultado
+
+# ----------------------------
+# BFS bidirecional
+# ----------------------------
+# Cresce uma frente a partir do início e outra a partir do fim, expandindo
+# sempre a menor delas uma camada inteira por vez. Quando uma camada toca a
+# outra frente, o melhor encontro daquela camada fecha o menor caminho.
+
+# O estado retornado é (pai_ida, pai_volta, encontro_ida, encontro_volta)
+def busca_bidirecional(inicio, fim, bloqueado, GRID_RESOLUCAO):
+    R = GRID_RESOLUCAO
+    origem = inicio[0] * R + inicio[1]
+    destino = fim[0] * R + fim[1]
+    if origem == destino:
+        registrar_visitados(1)
+        return None, None, origem, destino
+    if bloqueado[destino]:
+        registrar_visitados(1)
+        return None
+
+    pai_ida, pai_volta = [-1] * (R * R), [-1] * (R * R)
+    dist_ida, dist_volta = [-1] * (R * R), [-1] * (R * R)
+    pai_ida[origem], dist_ida[origem] = origem, 0
+    pai_volta[destino], dist_volta[destino] = destino, 0
+    fronteira_ida, fronteira_volta = [origem], [destino]
+    visitados = 2
+
+    while fronteira_ida and fronteira_volta:
+        ida = len(fronteira_ida) <= len(fronteira_volta)
+        if ida:
+            fronteira, pai, dist, dist_outro = fronteira_ida, pai_ida, dist_ida, dist_volta
+        else:
+            fronteira, pai, dist, dist_outro = fronteira_volta, pai_volta, dist_volta, dist_ida
+
+        nova = []
+        melhor = None # (comprimento, célula deste lado, célula do outro lado)
+        for atual in fronteira:
+            lin, col = divmod(atual, R)
+            for dl, dc in DIRECOES:
+                nl, nc = lin + dl, col + dc
+                if not (0 <= nl < R and 0 <= nc < R):
+                    continue
+                vizinho = nl * R + nc
+                # O início pode estar sobre um obstáculo (como na BFS comum)
+                if bloqueado[vizinho] and vizinho != origem:
+                    continue
+                if dist_outro[vizinho] != -1:
+                    total = dist[atual] + 1 + dist_outro[vizinho]
+                    if melhor is None or total < melhor[0]:
+                        melhor = (total, atual, vizinho)
+                if dist[vizinho] == -1:
+                    dist[vizinho] = dist[atual] + 1
+                    pai[vizinho] = atual
+                    visitados += 1
+                    nova.append(vizinho)
+
+        if melhor is not None:
+            registrar_visitados(visitados)
+            _, deste_lado, do_outro = melhor
+            encontro_ida, encontro_volta = (deste_lado, do_outro) if ida else (do_outro, deste_lado)
+            return pai_ida, pai_volta, encontro_ida, encontro_volta
+
+        if ida:
+            fronteira_ida = nova
+        else:
+            fronteira_volta = nova
+
+    registrar_visitados(visitados)
+    return None
+
+# Junta as duas metades: início -> encontro_ida (pai_ida) e encontro_volta -> fim (pai_volta)
+def reconstruir_bidirecional(estado, inicio, fim, GRID_RESOLUCAO):
+    R = GRID_RESOLUCAO
+    pai_ida, pai_volta, encontro_ida, encontro_volta = estado
+    origem = inicio[0] * R + inicio[1]
+    destino = fim[0] * R + fim[1]
+    if origem == destino:
+        return [inicio]
+    caminho = reconstruir_caminho(pai_ida, origem, encontro_ida, R)
+    atual = encontro_volta
+    while True:
+        caminho.append(divmod(atual, R))
+        if atual == destino:
+            break
+        atual = pai_volta[atual]
+    return caminho
+
+def menor_caminho_bidirecional(inicio, fim, bloqueado, GRID_RESOLUCAO):
+    estado = busca_bidirecional(inicio, fim, bloqueado, GRID_RESOLUCAO)
+    if estado is None:
+        return None
+    return reconstruir_bidirecional(estado, inicio, fim, GRID_RESOLUCAO)
+
+# ----------------------------
+# Busca por frente de onda (wavefront) vetorizada
+# ----------------------------
+# A BFS tradicional expande uma célula por vez no interpretador: O(R^2) passos.
+# Aqui a frente de onda inteira avança de uma vez com deslocamentos de matrizes
+# booleanas, então o mapa de distâncias sai em O(L) passos vetorizados, onde L é
+# o comprimento do caminho mais longo.
+
+# Converte um conjunto de obstáculos em uma matriz booleana de células livres
+def grade_livre(obstaculos, GRID_RESOLUCAO):
+    livre = np.ones((GRID_RESOLUCAO, GRID_RESOLUCAO), dtype=bool)
+    if obstaculos:
+        lins, cols = zip(*obstaculos)
+        livre[list(lins), list(cols)] = False
+    return livre
+
+# Mapa de distâncias (em passos) a partir de `origem`; -1 = inalcançável.
+# Se `alvo` for informado, a expansão para assim que ele é atingido.
+def mapa_distancias(livre, origem, alvo=None):
+    dist = np.full(livre.shape, -1, dtype=np.int32)
+    visitado = np.zeros(livre.shape, dtype=bool)
+    fronteira = np.zeros(livre.shape, dtype=bool)
+    fronteira[origem] = True
+    visitado[origem] = True
+    dist[origem] = 0
+
+    passo = 0
+    while fronteira.any():
+        if alvo is not None and visitado[alvo]:
+            break
+        passo += 1
+        nova = np.zeros(livre.shape, dtype=bool)
+        nova[1:, :] |= fronteira[:-1, :]  # para baixo
+        nova[:-1, :] |= fronteira[1:, :]  # para cima
+        nova[:, 1:] |= fronteira[:, :-1]  # para a direita
+        nova[:, :-1] |= fronteira[:, 1:]  # para a esquerda
+        nova &= livre
+        nova &= ~visitado
+        visitado |= nova
+        dist[nova] = passo
+        fronteira = nova
+    return dist
+
+# Desce o gradiente do mapa de distâncias (calculado a partir de `fim`)
+# começando em `inicio`; cada passo vai para um vizinho com distância d-1.
+def caminho_por_gradiente(dist, inicio, fim):
+    if dist[inicio] < 0:
+        return None
+    n_lin, n_col = dist.shape
+    caminho = [inicio]
+    atual = inicio
+    while atual != fim:
+        d = dist[atual]
+        lin, col = atual
+        for dl, dc in DIRECOES:
+            nl, nc = lin + dl, col + dc
+            if 0 <= nl < n_lin and 0 <= nc < n_col and dist[nl, nc] == d - 1:
+                atual = (nl, nc)
+                break
+        caminho.append(atual)
+    return caminho
+
+# A onda parte do fim; o início é tratado como livre, como na BFS.
+# O estado retornado é o mapa de distâncias até o fim.
+def busca_wavefront(inicio, fim, livre, GRID_RESOLUCAO=None):
+    if not livre[fim] and inicio != fim:
+        return None
+    if not livre[inicio]:
+        livre = livre.copy()
+        livre[inicio] = True
+    dist = mapa_distancias(livre, fim, alvo=inicio)
+    registrar_visitados(int((dist >= 0).sum()))
+    if dist[inicio] < 0:
+        return None
+    return dist
+
+def reconstruir_wavefront(dist, inicio, fim, GRID_RESOLUCAO=None):
+    return caminho_por_gradiente(dist, inicio, fim)
+
+# Menor caminho [inicio, ..., fim] usando a frente de onda
+def menor_caminho_wavefront(inicio, fim, livre):
+    dist = busca_wavefront(inicio, fim, livre)
+    if dist is None:
+        return None
+    return reconstruir_wavefront(dist, inicio, fim)
+
+# ----------------------------
+# Modos disponíveis: (busca, reconstrução)
+# ----------------------------
+# BFS e BIDIRECIONAL usam a grade de ocupação plana; WAVEFRONT usa a matriz de células livres.
+MODOS = {
+    "BFS": (busca_bfs, reconstruir_bfs),
+    "BIDIRECIONAL": (busca_bidirecional, reconstruir_bidirecional),
+    "WAVEFRONT": (busca_wavefront, reconstruir_wavefront),
+}
+
+def preparar_grade(obstaculos, GRID_RESOLUCAO, modo):
+    if modo == "WAVEFRONT":
+        return grade_livre(obstaculos, GRID_RESOLUCAO)
+    return mapa_ocupacao(obstaculos, GRID_RESOLUCAO)
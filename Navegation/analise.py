@@ -1,117 +1,115 @@
 import random
 import time
 import matplotlib.pyplot as plt
-from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
 import numpy as np
+from cenarios import gerar_cenario
+from algoritmos import (ComponentesConexos, mapa_ocupacao, preparar_grade, menor_caminho_bfs,
+                        menor_caminho_bidirecional, menor_caminho_wavefront, estatisticas)
 
 # ----------------------------
 # Funções de geração e caminhos
 # ----------------------------
 
 # função menor_caminho
-def menor_caminho(inicio, fim, obstaculos, GRID_RESOLUCAO):
-    filas = deque([(inicio, [inicio])])
-    visitados = {inicio}
-    direcoes = [(1,0), (-1,0), (0,1), (0,-1)]
-    while filas:
-        (lin, col), caminho = filas.popleft()
-        if (lin, col) == fim:
-            return caminho
-        for dl, dc in direcoes:
-            nl, nc = lin + dl, col + dc
-            if 0 <= nl < GRID_RESOLUCAO and 0 <= nc < GRID_RESOLUCAO and (nl, nc) not in visitados and (nl, nc) not in obstaculos:
-                visitados.add((nl, nc))
-                filas.append(((nl, nc), caminho + [(nl, nc)]))
-    return None
-
-
-def gerar_aleatorio(GRID_RESOLUCAO, densidade_obstaculos, dist="uniforme"):
-    obstaculos = set()
-    pontos_inicio = []
-    pontos_fim = []
-    caminhos = []
-
-    n_obstaculos = int((GRID_RESOLUCAO ** 2) * densidade_obstaculos)
-    n_pares = GRID_RESOLUCAO # Mantém n_pares = O(R)
-
-    # Obstáculos aleatórios
-    while len(obstaculos) < n_obstaculos:
-        cel = (random.randint(0, GRID_RESOLUCAO-1), random.randint(0, GRID_RESOLUCAO-1))
-        obstaculos.add(cel)
-
-    if dist == "uniforme":
-        while len(pontos_inicio) < n_pares:
-            lin = random.randint(0, GRID_RESOLUCAO-1)
-            col = random.randint(0, GRID_RESOLUCAO-1)
-            if (lin, col) in obstaculos or (lin, col) in pontos_inicio or (lin, col) in pontos_fim:
-                continue
-            pontos_inicio.append((lin, col))
-
-            while True:
-                lin_f = random.randint(0, GRID_RESOLUCAO-1)
-                col_f = random.randint(0, GRID_RESOLUCAO-1)
-                if (lin_f, col_f) in obstaculos or (lin_f, col_f) in pontos_inicio or (lin_f, col_f) in pontos_fim:
-                    continue
-                pontos_fim.append((lin_f, col_f))
-                break 
-
-    elif dist == "cluster":
-        RAIO_CLUSTER = max(2, GRID_RESOLUCAO // 10) 
-        n_clusters = max(1, n_pares // 5)
-        cluster_centers = [(random.randint(0, GRID_RESOLUCAO-1), random.randint(0, GRID_RESOLUCAO-1)) for _ in range(n_clusters)]
-        
-        while len(pontos_inicio) < n_pares:
-            c = random.choice(cluster_centers)
-            lin = min(max(c[0] + random.randint(-RAIO_CLUSTER, RAIO_CLUSTER), 0), GRID_RESOLUCAO-1)
-            col = min(max(c[1] + random.randint(-RAIO_CLUSTER, RAIO_CLUSTER), 0), GRID_RESOLUCAO-1)
-            
-            if (lin, col) in obstaculos or (lin, col) in pontos_inicio or (lin, col) in pontos_fim:
-                continue
-            pontos_inicio.append((lin, col))
-
-            while True:
-                lin_f = min(max(c[0] + random.randint(-RAIO_CLUSTER, RAIO_CLUSTER), 0), GRID_RESOLUCAO-1)
-                col_f = min(max(c[1] + random.randint(-RAIO_CLUSTER, RAIO_CLUSTER), 0), GRID_RESOLUCAO-1)
-                
-                if (lin_f, col_f) in obstaculos or (lin_f, col_f) in pontos_inicio or (lin_f, col_f) in pontos_fim:
-                    continue
-                pontos_fim.append((lin_f, col_f))
-                break
-
-    # Gerar caminhos
-    for i in range(len(pontos_inicio)):
-        # Verificação para garantir que o ponto de início não seja um obstáculo
-        if pontos_inicio[i] in obstaculos or pontos_fim[i] in obstaculos:
-            continue 
-            
-        caminho = menor_caminho(pontos_inicio[i], pontos_fim[i], obstaculos, GRID_RESOLUCAO)
-        if caminho:
-            caminhos.append(caminho)
-
-    return caminhos
-
-
-def analisar_desempenho_por_resolucao(resolucoes=[10,20,30,40,50]):
+# modo="BFS" usa a BFS com lista de predecessores de algoritmos.py,
+# modo="WAVEFRONT" a frente de onda vetorizada e modo="BIDIRECIONAL" a BFS a
+# partir das duas pontas. `grade` (matriz booleana de células livres ou grade de
+# ocupação plana) pode ser passada para não reconstruí-la a cada par.
+# O número de células visitadas fica em estatisticas["visitados"].
+def menor_caminho(inicio, fim, obstaculos, GRID_RESOLUCAO, modo="BFS", grade=None):
+    if grade is None:
+        grade = preparar_grade(obstaculos, GRID_RESOLUCAO, modo)
+    if modo == "WAVEFRONT":
+        return menor_caminho_wavefront(inicio, fim, grade)
+    if modo == "BIDIRECIONAL":
+        return menor_caminho_bidirecional(inicio, fim, grade, GRID_RESOLUCAO)
+    return menor_caminho_bfs(inicio, fim, grade, GRID_RESOLUCAO)
+
+
+# Com executor (um ProcessPoolExecutor aberto uma vez por varredura, ver
+# abrir_pool) os pares são divididos em `processos` lotes entre os workers.
+# O cenário não viaja: cada worker o regenera a partir da semente na primeira
+# vez que o vê, por isso uma semente é sorteada quando nenhuma é passada.
+def gerar_aleatorio(GRID_RESOLUCAO, densidade_obstaculos, dist="uniforme", modo="BFS", semente=None,
+                    executor=None, processos=1):
+    if semente is None:
+        semente = random.randrange(2 ** 32)
+    cenario = (GRID_RESOLUCAO, densidade_obstaculos, dist, semente)
+    return resolver_pares(cenario, modo, executor, processos)
+
+
+# Pool de processos reaproveitado por todos os pontos de uma varredura
+# (nullcontext quando a execução é serial)
+def abrir_pool(processos):
+    return ProcessPoolExecutor(max_workers=processos) if processos > 1 else nullcontext()
+
+
+# Resolve todos os pares do cenário (R, densidade, dist, semente). A ordem dos
+# resultados é a mesma da execução serial, e os workers devolvem também as
+# células visitadas, somadas em estatisticas como na execução serial.
+def resolver_pares(cenario, modo="BFS", executor=None, processos=1):
+    GRID_RESOLUCAO = cenario[0]
+    obstaculos, pontos_inicio, pontos_fim = gerar_cenario(*cenario)
+    # Verificação para garantir que início e fim não sejam obstáculos e estejam
+    # na mesma região livre (pares sem caminho são descartados sem busca)
+    componentes = ComponentesConexos(mapa_ocupacao(obstaculos, GRID_RESOLUCAO), GRID_RESOLUCAO)
+    pares = [(inicio, fim) for inicio, fim in zip(pontos_inicio, pontos_fim)
+             if inicio not in obstaculos and fim not in obstaculos and componentes.conectados(inicio, fim)]
+
+    if executor is not None and processos > 1 and len(pares) > 1:
+        tamanho_lote = -(-len(pares) // processos) # Divisão arredondada para cima
+        lotes = [pares[k:k + tamanho_lote] for k in range(0, len(pares), tamanho_lote)]
+        resultados = []
+        for caminhos, visitados, visitados_total in executor.map(_resolver_lote, [cenario] * len(lotes),
+                                                                 [modo] * len(lotes), lotes):
+            resultados.extend(caminhos)
+            estatisticas["visitados"] = visitados
+            estatisticas["visitados_total"] += visitados_total
+    else:
+        grade = preparar_grade(obstaculos, GRID_RESOLUCAO, modo)
+        resultados = [menor_caminho(inicio, fim, obstaculos, GRID_RESOLUCAO, modo, grade) for inicio, fim in pares]
+
+    return [caminho for caminho in resultados if caminho]
+
+
+# --- Estado de cada processo worker: último cenário visto e sua grade ---
+_cenario_worker = {}
+
+def _resolver_lote(cenario, modo, pares):
+    c = _cenario_worker
+    if c.get("chave") != (cenario, modo):
+        obstaculos, _, _ = gerar_cenario(*cenario)
+        c["chave"], c["obstaculos"] = (cenario, modo), obstaculos
+        c["grade"] = preparar_grade(obstaculos, cenario[0], modo)
+    total_antes = estatisticas["visitados_total"] # O worker é reaproveitado entre lotes
+    caminhos = [menor_caminho(inicio, fim, c["obstaculos"], cenario[0], modo, c["grade"]) for inicio, fim in pares]
+    return caminhos, estatisticas["visitados"], estatisticas["visitados_total"] - total_antes
+
+
+def analisar_desempenho_por_resolucao(resolucoes=[10,20,30,40,50], processos=1):
     tempos_uniforme = []
     tempos_cluster = []
     
     # Densidade fixa 20% do grid
     DENSIDADE_FIXA = 0.20 
 
-    for res in resolucoes:
-        print(f"Resolução: {res} (Uniforme)")
-        start = time.time()
-        # Passa a densidade fixa
-        gerar_aleatorio(res, DENSIDADE_FIXA, dist="uniforme")
-        end = time.time()
-        tempos_uniforme.append(end-start)
-
-        print(f"Resolução: {res} (Cluster)")
-        start = time.time()
-        # Passa a densidade fixa
-        gerar_aleatorio(res, DENSIDADE_FIXA, dist="cluster")
-        end = time.time()
-        tempos_cluster.append(end-start)
+    with abrir_pool(processos) as executor:
+        for res in resolucoes:
+            print(f"Resolução: {res} (Uniforme)")
+            start = time.time()
+            # Passa a densidade fixa
+            gerar_aleatorio(res, DENSIDADE_FIXA, dist="uniforme", executor=executor, processos=processos)
+            end = time.time()
+            tempos_uniforme.append(end-start)
+
+            print(f"Resolução: {res} (Cluster)")
+            start = time.time()
+            # Passa a densidade fixa
+            gerar_aleatorio(res, DENSIDADE_FIXA, dist="cluster", executor=executor, processos=processos)
+            end = time.time()
+            tempos_cluster.append(end-start)
 
     # Plot
     plt.figure(figsize=(10,6))
@@ -125,7 +123,7 @@ def analisar_desempenho_por_resolucao(resolucoes=[10,20,30,40,50]):
     plt.show()
 
 # função de análise por densidade
-def analisar_desempenho_por_densidade(resolucao_fixa=60): # Use uma resolução média/alta
+def analisar_desempenho_por_densidade(resolucao_fixa=60, processos=1): # Use uma resolução média/alta
     
     # Cria uma lista de densidades para testar
     densidades = np.linspace(0.0, 0.7, 15) # 15 pontos de 0% a 70%
@@ -133,13 +131,14 @@ def analisar_desempenho_por_densidade(resolucao_fixa=60): # Use uma resolução
     
     print(f"Iniciando análise por densidade (Resolução fixa em {resolucao_fixa})")
 
-    for dens in densidades:
-        print(f"Testando Densidade: {dens*100:.1f}%")
-        start = time.time()
-        gerar_aleatorio(resolucao_fixa, dens, dist="uniforme")
-        end = time.time()
-        print(f"Tempo de execução: {end-start} segundos")
-        tempos_uniforme.append(end-start)
+    with abrir_pool(processos) as executor:
+        for dens in densidades:
+            print(f"Testando Densidade: {dens*100:.1f}%")
+            start = time.time()
+            gerar_aleatorio(resolucao_fixa, dens, dist="uniforme", executor=executor, processos=processos)
+            end = time.time()
+            print(f"Tempo de execução: {end-start} segundos")
+            tempos_uniforme.append(end-start)
 
     # Plot
     plt.figure(figsize=(10,6))
@@ -152,6 +151,30 @@ def analisar_desempenho_por_densidade(resolucao_fixa=60): # Use uma resolução
     plt.show()
 
 
+# função de comparação de células visitadas: BFS x BFS bidirecional
+def analisar_visitados_bidirecional(resolucoes=[10,20,30,40,50], densidade=0.20):
+    visitados_bfs = []
+    visitados_bidirecional = []
+
+    for res in resolucoes:
+        for modo, lista in (("BFS", visitados_bfs), ("BIDIRECIONAL", visitados_bidirecional)):
+            estatisticas["visitados_total"] = 0
+            gerar_aleatorio(res, densidade, dist="uniforme", modo=modo, semente=res) # Mesmo cenário para os dois modos
+            lista.append(estatisticas["visitados_total"])
+        print(f"Resolução: {res} | BFS: {visitados_bfs[-1]} | Bidirecional: {visitados_bidirecional[-1]} células visitadas")
+
+    # Plot
+    plt.figure(figsize=(10,6))
+    plt.plot(resolucoes, visitados_bfs, marker='o', label="BFS")
+    plt.plot(resolucoes, visitados_bidirecional, marker='s', label="BFS Bidirecional")
+    plt.xlabel("Resolução do Grid")
+    plt.ylabel("Células Visitadas (soma de todos os pares)")
+    plt.title(f"Células Visitadas x Resolução (Densidade Fixa em {densidade*100:.0f}%)")
+    plt.legend()
+    plt.grid(True)
+    plt.show()
+
+
 if __name__ == "__main__":
     
     # Gráfico 1: Tempo vs Resolução
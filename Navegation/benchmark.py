@@ -0,0 +1,162 @@
+import argparse
+import csv
+import json
+import platform
+import time
+from cenarios import gerar_cenario
+from algoritmos import MODOS, preparar_grade
+
+# ----------------------------
+# Benchmark reproduzível dos modos de busca
+# ----------------------------
+# Cada medição usa um cenário gerado com semente fixa, então duas versões do
+# código medidas com os mesmos parâmetros resolvem exatamente os mesmos cenários.
+# Geração, preparação da grade, busca e reconstrução do caminho são
+# cronometradas separadamente com time.perf_counter_ns().
+
+FASES = ("geracao", "preparacao", "busca", "reconstrucao")
+PERCENTIS = (5, 25, 75, 95)
+
+
+# Percentil com interpolação linear (valores já ordenados)
+def percentil(ordenados, p):
+    if len(ordenados) == 1:
+        return ordenados[0]
+    pos = (len(ordenados) - 1) * p / 100
+    baixo = int(pos)
+    alto = min(baixo + 1, len(ordenados) - 1)
+    return ordenados[baixo] + (ordenados[alto] - ordenados[baixo]) * (pos - baixo)
+
+
+def resumir(amostras):
+    ordenados = sorted(amostras)
+    resumo = {
+        "n": len(ordenados),
+        "mediana_ns": percentil(ordenados, 50),
+        "min_ns": ordenados[0],
+        "max_ns": ordenados[-1],
+    }
+    for p in PERCENTIS:
+        resumo[f"p{p}_ns"] = percentil(ordenados, p)
+    return resumo
+
+
+# Mede uma execução completa: gera o cenário e resolve todos os pares
+def medir_cenario(GRID_RESOLUCAO, densidade, dist, modo, semente):
+    busca, reconstruir = MODOS[modo]
+    tempos = dict.fromkeys(FASES, 0)
+
+    t0 = time.perf_counter_ns()
+    obstaculos, pontos_inicio, pontos_fim = gerar_cenario(GRID_RESOLUCAO, densidade, dist, semente)
+    tempos["geracao"] = time.perf_counter_ns() - t0
+
+    t0 = time.perf_counter_ns()
+    grade = preparar_grade(obstaculos, GRID_RESOLUCAO, modo)
+    tempos["preparacao"] = time.perf_counter_ns() - t0
+
+    encontrados = 0
+    for inicio, fim in zip(pontos_inicio, pontos_fim):
+        if inicio in obstaculos or fim in obstaculos:
+            continue
+        t0 = time.perf_counter_ns()
+        estado = busca(inicio, fim, grade, GRID_RESOLUCAO)
+        t1 = time.perf_counter_ns()
+        tempos["busca"] += t1 - t0
+        if estado is not None:
+            reconstruir(estado, inicio, fim, GRID_RESOLUCAO)
+            tempos["reconstrucao"] += time.perf_counter_ns() - t1
+            encontrados += 1
+    return tempos, encontrados
+
+
+# Roda todas as combinações de parâmetros. A repetição i usa a semente
+# `semente + i`; o aquecimento usa sementes negativas e é descartado.
+def executar_benchmark(resolucoes, densidades, dists, modos, repeticoes=5, aquecimento=1, semente=0):
+    linhas = []
+    for modo in modos:
+        for dist in dists:
+            for res in resolucoes:
+                for dens in densidades:
+                    for i in range(aquecimento):
+                        medir_cenario(res, dens, dist, modo, -(i + 1))
+
+                    amostras = {fase: [] for fase in FASES}
+                    encontrados = [] # Caminhos encontrados em cada repetição (cada uma tem seu cenário)
+                    for i in range(repeticoes):
+                        tempos, n_caminhos = medir_cenario(res, dens, dist, modo, semente + i)
+                        encontrados.append(n_caminhos)
+                        for fase in FASES:
+                            amostras[fase].append(tempos[fase])
+
+                    medianas = {}
+                    for fase in FASES:
+                        linha = {"modo": modo, "dist": dist, "resolucao": res, "densidade": dens,
+                                 "fase": fase, "caminhos": sum(encontrados), "caminhos_por_repeticao": encontrados}
+                        linha.update(resumir(amostras[fase]))
+                        linhas.append(linha)
+                        medianas[fase] = linha["mediana_ns"] / 1e6
+                    print(f"{modo} | {dist} | R={res} | densidade={dens:.2f} | "
+                          f"preparação (mediana): {medianas['preparacao']:.3f} ms | busca (mediana): {medianas['busca']:.3f} ms")
+    return linhas
+
+
+def salvar_csv(linhas, nome_arquivo):
+    with open(nome_arquivo, 'w', newline='', encoding='utf-8') as arquivo:
+        writer = csv.DictWriter(arquivo, fieldnames=list(linhas[0].keys()))
+        writer.writeheader()
+        writer.writerows(linhas)
+    print(f"Arquivo '{nome_arquivo}' salvo com sucesso!")
+
+
+def salvar_json(linhas, parametros, nome_arquivo):
+    dados = {
+        "parametros": parametros,
+        "ambiente": {"python": platform.python_version(), "plataforma": platform.platform()},
+        "resultados": linhas,
+    }
+    with open(nome_arquivo, 'w', encoding='utf-8') as arquivo:
+        json.dump(dados, arquivo, indent=2)
+    print(f"Arquivo '{nome_arquivo}' salvo com sucesso!")
+
+
+# Compara as medianas de dois arquivos JSON do benchmark e lista as regressões
+# (mediana nova maior que a antiga por mais que `tolerancia`).
+def comparar(arquivo_base, arquivo_novo, tolerancia=0.10):
+    def carregar(nome):
+        with open(nome, encoding='utf-8') as arquivo:
+            resultados = json.load(arquivo)["resultados"]
+        return {(r["modo"], r["dist"], r["resolucao"], r["densidade"], r["fase"]): r for r in resultados}
+
+    base, novo = carregar(arquivo_base), carregar(arquivo_novo)
+    regressoes = []
+    for chave in sorted(base.keys() & novo.keys(), key=str):
+        antes, depois = base[chave]["mediana_ns"], novo[chave]["mediana_ns"]
+        if antes > 0 and (depois - antes) / antes > tolerancia:
+            regressoes.append((chave, antes, depois))
+            print(f"REGRESSÃO {chave}: {antes / 1e6:.3f} ms -> {depois / 1e6:.3f} ms")
+    if not regressoes:
+        print("Nenhuma regressão acima da tolerância.")
+    return regressoes
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark dos modos de busca da Navegação")
+    parser.add_argument("--resolucoes", type=int, nargs="+", default=[10, 20, 30, 40, 50])
+    parser.add_argument("--densidades", type=float, nargs="+", default=[0.2])
+    parser.add_argument("--dists", nargs="+", default=["uniforme", "cluster"])
+    parser.add_argument("--modos", nargs="+", default=list(MODOS))
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--aquecimento", type=int, default=1)
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--csv", default="benchmark_navegacao.csv")
+    parser.add_argument("--json", default="benchmark_navegacao.json")
+    parser.add_argument("--comparar", metavar="BASE_JSON", help="Compara o resultado com um JSON anterior")
+    args = parser.parse_args()
+
+    parametros = {k: v for k, v in vars(args).items() if k not in ("csv", "json", "comparar")}
+    linhas = executar_benchmark(args.resolucoes, args.densidades, args.dists, args.modos,
+                                args.repeticoes, args.aquecimento, args.semente)
+    salvar_csv(linhas, args.csv)
+    salvar_json(linhas, parametros, args.json)
+    if args.comparar:
+        comparar(args.comparar, args.json)
@@ -0,0 +1,108 @@
+import json
+import random
+
+# ----------------------------
+# Geração de cenários sem laços de rejeição
+# ----------------------------
+# Obstáculos e pontos são sorteados sem reposição de uma só vez (random.sample
+# sobre os índices planos lin * GRID_RESOLUCAO + col), então o custo não explode
+# em densidades altas como no "sorteia e tenta de novo". Total: O(R^2).
+
+def gerar_cenario(GRID_RESOLUCAO, densidade_obstaculos, dist="uniforme", semente=None, n_pares=None):
+    rng = random.Random(semente)
+    R = GRID_RESOLUCAO
+    n_celulas = R * R
+    n_obstaculos = min(int(n_celulas * densidade_obstaculos), n_celulas)
+    if n_pares is None:
+        n_pares = R # Mantém n_pares = O(R)
+
+    if dist == "uniforme":
+        # Um único sorteio: obstáculos, depois inícios, depois fins
+        n_pares = min(n_pares, (n_celulas - n_obstaculos) // 2)
+        sorteio = rng.sample(range(n_celulas), n_obstaculos + 2 * n_pares)
+        obstaculos = {divmod(i, R) for i in sorteio[:n_obstaculos]}
+        pontos_inicio = [divmod(i, R) for i in sorteio[n_obstaculos:n_obstaculos + n_pares]]
+        pontos_fim = [divmod(i, R) for i in sorteio[n_obstaculos + n_pares:]]
+        return obstaculos, pontos_inicio, pontos_fim
+
+    if dist == "cluster":
+        sorteio = rng.sample(range(n_celulas), n_obstaculos)
+        ocupado = bytearray(n_celulas)
+        for i in sorteio:
+            ocupado[i] = 1
+        obstaculos = {divmod(i, R) for i in sorteio}
+        pontos_inicio, pontos_fim = _pares_em_clusters(rng, R, ocupado, n_pares)
+        return obstaculos, pontos_inicio, pontos_fim
+
+    raise ValueError(f"Distribuição desconhecida: {dist}")
+
+
+# Cada par sai de um cluster sorteado: início e fim ficam dentro da janela
+# (centro ± RAIO_CLUSTER) daquele cluster. As células livres de cada janela são
+# embaralhadas uma única vez, na primeira vez que o cluster é usado, e consumidas em ordem.
+def _pares_em_clusters(rng, R, ocupado, n_pares):
+    RAIO_CLUSTER = max(2, R // 10)
+    n_clusters = max(1, n_pares // 5)
+    centros = [(rng.randint(0, R-1), rng.randint(0, R-1)) for _ in range(n_clusters)]
+
+    fila_cluster = {} # índice do cluster -> [células embaralhadas, próxima posição]
+    ativos = list(range(n_clusters))
+    pontos_inicio, pontos_fim = [], []
+
+    def proxima_livre(k):
+        if k not in fila_cluster:
+            c_lin, c_col = centros[k]
+            janela = [l * R + c
+                      for l in range(max(0, c_lin - RAIO_CLUSTER), min(R, c_lin + RAIO_CLUSTER + 1))
+                      for c in range(max(0, c_col - RAIO_CLUSTER), min(R, c_col + RAIO_CLUSTER + 1))
+                      if not ocupado[l * R + c]]
+            fila_cluster[k] = [rng.sample(janela, len(janela)), 0]
+        celulas, pos = fila_cluster[k]
+        while pos < len(celulas) and ocupado[celulas[pos]]: # Já usada por outro cluster
+            pos += 1
+        fila_cluster[k][1] = pos + 1
+        return celulas[pos] if pos < len(celulas) else None
+
+    while len(pontos_inicio) < n_pares and ativos:
+        k = rng.choice(ativos)
+        inicio = proxima_livre(k)
+        fim = proxima_livre(k) if inicio is not None else None
+        if fim is None:
+            # Cluster esgotado: não sorteia mais este cluster
+            ativos.remove(k)
+            continue
+        ocupado[inicio] = ocupado[fim] = 2 # Marca como ponto já usado
+        pontos_inicio.append(divmod(inicio, R))
+        pontos_fim.append(divmod(fim, R))
+
+    return pontos_inicio, pontos_fim
+
+
+# ----------------------------
+# Arquivos de cenário (JSON)
+# ----------------------------
+# Formato: {"resolucao": R, "obstaculos": [[lin, col], ...],
+#           "pontos_inicio": [[lin, col], ...], "pontos_fim": [[lin, col], ...]}
+# Um arquivo pode conter um cenário ou uma lista deles.
+
+def salvar_cenario(nome_arquivo, GRID_RESOLUCAO, obstaculos, pontos_inicio, pontos_fim):
+    dados = {
+        "resolucao": GRID_RESOLUCAO,
+        "obstaculos": sorted([lin, col] for lin, col in obstaculos),
+        "pontos_inicio": [list(p) for p in pontos_inicio],
+        "pontos_fim": [list(p) for p in pontos_fim],
+    }
+    with open(nome_arquivo, 'w', encoding='utf-8') as arquivo:
+        json.dump(dados, arquivo)
+
+
+# Retorna uma lista de cenários (resolucao, obstaculos, pontos_inicio, pontos_fim)
+def carregar_cenarios(nome_arquivo):
+    with open(nome_arquivo, encoding='utf-8') as arquivo:
+        dados = json.load(arquivo)
+    if isinstance(dados, dict):
+        dados = [dados]
+    return [(d["resolucao"],
+             {tuple(p) for p in d["obstaculos"]},
+             [tuple(p) for p in d["pontos_inicio"]],
+             [tuple(p) for p in d["pontos_fim"]]) for d in dados]
@@ -0,0 +1,125 @@
+import argparse
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from cenarios import gerar_cenario, carregar_cenarios
+from algoritmos import ComponentesConexos, MODOS, caminhos_em_lote, mapa_ocupacao, preparar_grade
+
+# NumPy é opcional: só o modo WAVEFRONT precisa dele
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# ----------------------------
+# Modo em lote (sem pygame)
+# ----------------------------
+# Resolve muitos cenários de uma vez, lidos de arquivos JSON ou gerados a partir
+# de sementes, e grava os caminhos e os tempos em um arquivo JSON Lines (um
+# cenário por linha). Não importa pygame, então roda em servidores sem tela.
+#
+# Exemplos:
+#   python lote.py --sementes 0 999 --resolucao 50 --densidade 0.3 --saida resultados.jsonl
+#   python lote.py --arquivos cenario1.json cenario2.json --modo BIDIRECIONAL --saida resultados.jsonl
+
+
+# Resolve todos os pares de um cenário com a mesma regra do main.py: pares em
+# regiões diferentes são descartados sem busca; no modo BFS os pares são agrupados por início.
+def resolver_cenario(GRID_RESOLUCAO, obstaculos, pontos_inicio, pontos_fim, modo="BFS"):
+    t0 = time.perf_counter_ns()
+    bloqueado = mapa_ocupacao(obstaculos, GRID_RESOLUCAO)
+    componentes = ComponentesConexos(bloqueado, GRID_RESOLUCAO)
+    pares = list(zip(pontos_inicio, pontos_fim))
+    alcancaveis = [k for k, (inicio, fim) in enumerate(pares) if componentes.conectados(inicio, fim)]
+    t1 = time.perf_counter_ns()
+
+    caminhos = [None] * len(pares)
+    if modo == "BFS":
+        resultados = caminhos_em_lote([pares[k] for k in alcancaveis], bloqueado, GRID_RESOLUCAO)
+        for k, (caminho, _) in zip(alcancaveis, resultados):
+            caminhos[k] = caminho
+    else:
+        busca, reconstruir = MODOS[modo]
+        grade = bloqueado if modo != "WAVEFRONT" else preparar_grade(obstaculos, GRID_RESOLUCAO, modo)
+        for k in alcancaveis:
+            inicio, fim = pares[k]
+            estado = busca(inicio, fim, grade, GRID_RESOLUCAO)
+            if estado is not None:
+                caminhos[k] = reconstruir(estado, inicio, fim, GRID_RESOLUCAO)
+    t2 = time.perf_counter_ns()
+
+    tempos = {"preparacao_ns": t1 - t0, "busca_ns": t2 - t1}
+    return caminhos, tempos
+
+
+# Uma tarefa = um cenário. `origem` é ("semente", n, resolucao, densidade, dist)
+# ou ("arquivo", nome, indice, cenario).
+def executar_tarefa(origem, modo, incluir_caminhos):
+    t0 = time.perf_counter_ns()
+    if origem[0] == "semente":
+        _, semente, resolucao, densidade, dist = origem
+        obstaculos, pontos_inicio, pontos_fim = gerar_cenario(resolucao, densidade, dist, semente)
+        registro = {"semente": semente, "resolucao": resolucao, "densidade": densidade, "dist": dist}
+    else:
+        _, nome, indice, (resolucao, obstaculos, pontos_inicio, pontos_fim) = origem
+        registro = {"arquivo": nome, "indice": indice, "resolucao": resolucao}
+    t1 = time.perf_counter_ns()
+
+    caminhos, tempos = resolver_cenario(resolucao, obstaculos, pontos_inicio, pontos_fim, modo)
+    registro.update({
+        "modo": modo,
+        "pares": len(caminhos),
+        "encontrados": sum(1 for c in caminhos if c),
+        "geracao_ns": t1 - t0,
+    })
+    registro.update(tempos)
+    if incluir_caminhos:
+        registro["caminhos"] = [[list(p) for p in c] if c else None for c in caminhos]
+    return registro
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Planejador da Navegação em lote (sem pygame)")
+    fontes = parser.add_mutually_exclusive_group(required=True)
+    fontes.add_argument("--sementes", type=int, nargs=2, metavar=("PRIMEIRA", "ULTIMA"),
+                        help="Gera um cenário por semente no intervalo [PRIMEIRA, ULTIMA]")
+    fontes.add_argument("--arquivos", nargs="+", help="Arquivos JSON de cenário (ver cenarios.py)")
+    parser.add_argument("--resolucao", type=int, default=20)
+    parser.add_argument("--densidade", type=float, default=0.2)
+    parser.add_argument("--dist", default="uniforme", choices=["uniforme", "cluster"])
+    parser.add_argument("--modo", default="BFS", choices=list(MODOS))
+    parser.add_argument("--processos", type=int, default=1, help="Cenários resolvidos em paralelo")
+    parser.add_argument("--so-tempos", action="store_true", help="Não grava os caminhos, só contagens e tempos")
+    parser.add_argument("--saida", default="resultados_lote.jsonl")
+    args = parser.parse_args()
+    if args.modo == "WAVEFRONT" and np is None:
+        # Falha antes de começar, e não no meio do lote (ou dentro de um worker)
+        parser.error("o modo WAVEFRONT requer NumPy (pip install numpy); use BFS ou BIDIRECIONAL.")
+
+    if args.sementes:
+        primeira, ultima = args.sementes
+        tarefas = [("semente", s, args.resolucao, args.densidade, args.dist) for s in range(primeira, ultima + 1)]
+    else:
+        tarefas = [("arquivo", nome, i, cenario)
+                   for nome in args.arquivos
+                   for i, cenario in enumerate(carregar_cenarios(nome))]
+
+    inicio = time.perf_counter()
+    incluir_caminhos = not args.so_tempos
+    with open(args.saida, 'w', encoding='utf-8') as saida:
+        if args.processos > 1:
+            with ProcessPoolExecutor(max_workers=args.processos) as executor:
+                registros = executor.map(executar_tarefa, tarefas, [args.modo] * len(tarefas),
+                                         [incluir_caminhos] * len(tarefas), chunksize=16)
+                for registro in registros:
+                    saida.write(json.dumps(registro) + "\n")
+        else:
+            for tarefa in tarefas:
+                saida.write(json.dumps(executar_tarefa(tarefa, args.modo, incluir_caminhos)) + "\n")
+    duracao = time.perf_counter() - inicio
+    print(f"{len(tarefas)} cenários resolvidos em {duracao:.2f} s ({len(tarefas) / duracao * 60:.0f} por minuto). "
+          f"Resultados em '{args.saida}'.")
+
+
+if __name__ == "__main__":
+    main()
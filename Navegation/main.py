@@ -1,6 +1,14 @@
 import pygame
 import random
-from collections import deque
+from cenarios import gerar_cenario
+from algoritmos import (ComponentesConexos, mapa_ocupacao, caminhos_em_lote,
+                        menor_caminho_bfs, menor_caminho_bidirecional, menor_caminho_wavefront)
+
+# NumPy é opcional: usado para desenhar os obstáculos de uma vez e pelo modo WAVEFRONT
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 # --- Variáveis Globais ---
 tela = None
@@ -10,6 +18,27 @@ pontos_inicio = []
 pontos_fim = []
 obstaculos = set()
 caminhos = []
+# Estado de cada par para o reparo incremental: início, fim, cor, caminho atual e
+# a região explorada pela última busca (lista de predecessores; None = desconhecida)
+estado_pares = []
+MODO_BUSCA = "BFS" # "BFS", "BIDIRECIONAL" ou "WAVEFRONT" (frente de onda vetorizada, requer NumPy)
+# Grade de ocupação plana (1 byte por célula, índice lin * GRID_RESOLUCAO + col).
+# Mantida em sincronia com o conjunto `obstaculos` e usada diretamente pela BFS.
+ocupacao = bytearray(GRID_RESOLUCAO * GRID_RESOLUCAO)
+# Rótulos das regiões livres da grade (pares em regiões diferentes não têm caminho)
+componentes = ComponentesConexos(ocupacao, GRID_RESOLUCAO)
+
+# --- Camadas de desenho (cache) ---
+# Fundo + grid + obstáculos ficam em uma superfície fora da tela e caminhos + pontos
+# em outra; cada uma só é redesenhada quando invalidada. Sem mudanças, o quadro não
+# redesenha nada.
+camada_estatica = None
+camada_caminhos = None
+estatica_suja = True
+caminhos_sujos = True
+tela_suja = True
+fonte = None
+textos_renderizados = {} # texto -> superfície já renderizada
 
 # --- Cores ---
 BRANCO = (255, 255, 255)
@@ -80,18 +109,38 @@ def processar_eventos():
                 limpar_tudo()
             if evento.key == pygame.K_a:
                 gerar_aleatorio()
+        if evento.type == pygame.VIDEOEXPOSE:
+            marcar_sujo()
         if evento.type == pygame.MOUSEBUTTONDOWN:
             cel = obter_celula(evento.pos)
             if cel:
-                if modo_atual == "OBSTACULOS":
-                    if cel in obstaculos:
-                        obstaculos.remove(cel)
-                    else:
-                        obstaculos.add(cel)
+                if modo_atual in ("OBSTACULOS", "CAMINHOS"):
+                    alternar_obstaculo(cel)
+                    if estado_pares:
+                        reparar_caminhos(cel)
                 elif modo_atual == "PONTOS":
                     adicionar_ponto(cel)
     return True
 
+# --- Obstáculos (conjunto + grade de ocupação + componentes) ---
+def alternar_obstaculo(cel):
+    if cel in obstaculos:
+        obstaculos.remove(cel)
+        ocupacao[cel[0] * GRID_RESOLUCAO + cel[1]] = 0
+    else:
+        obstaculos.add(cel)
+        ocupacao[cel[0] * GRID_RESOLUCAO + cel[1]] = 1
+    componentes.atualizar(cel) # Só a região afetada é rotulada de novo
+    marcar_sujo(estatica=True)
+
+# Vários obstáculos de uma vez: os rótulos são recalculados uma única vez no final
+def adicionar_obstaculos(celulas):
+    for cel in celulas:
+        obstaculos.add(cel)
+        ocupacao[cel[0] * GRID_RESOLUCAO + cel[1]] = 1
+    componentes.recalcular()
+    marcar_sujo(estatica=True)
+
 # --- Alternar modos ---
 def alternar_modo():
     global modo_atual, caminhos
@@ -103,6 +152,8 @@ def alternar_modo():
     elif modo_atual == "CAMINHOS":
         modo_atual = "OBSTACULOS"
         caminhos.clear()
+        estado_pares.clear()
+    marcar_sujo(caminhos=True)
     print(f"Modo atual: {modo_atual}")
 
 # --- Adicionar ponto ---
@@ -113,33 +164,79 @@ def adicionar_ponto(cel):
         pontos_inicio.append(cel)
     else:
         pontos_fim.append(cel)
+    marcar_sujo(caminhos=True)
 
 # --- Gerar caminhos entre dois pares de pontos ---
 def gerar_caminhos():
-    global caminhos
-    caminhos = []
+    global estado_pares
     pares_validos = min(len(pontos_inicio), len(pontos_fim))
-    for i in range(pares_validos):
-        cor = tuple(random.randint(50,255) for _ in range(3))
-        caminho = menor_caminho(pontos_inicio[i], pontos_fim[i], obstaculos)
-        if caminho:
-            caminhos.append((caminho, cor))
-
-# --- BFS menor caminho ---
-def menor_caminho(inicio, fim, obstaculos):
-    filas = deque([(inicio, [inicio])])
-    visitados = {inicio}
-    direcoes = [(1,0), (-1,0), (0,1), (0,-1)]
-    while filas:
-        (lin, col), caminho = filas.popleft()
-        if (lin, col) == fim:
-            return caminho
-        for dl, dc in direcoes:
-            nl, nc = lin + dl, col + dc
-            if 0 <= nl < GRID_RESOLUCAO and 0 <= nc < GRID_RESOLUCAO and (nl, nc) not in visitados and (nl, nc) not in obstaculos:
-                visitados.add((nl, nc))
-                filas.append(((nl, nc), caminho + [(nl, nc)]))
-    return None
+    estado_pares = [{"inicio": pontos_inicio[i], "fim": pontos_fim[i],
+                     "cor": tuple(random.randint(50,255) for _ in range(3)),
+                     "caminho": None, "explorado": None}
+                    for i in range(pares_validos)]
+    resolver_pares(range(pares_validos))
+
+# --- (Re)calcula os caminhos dos pares indicados ---
+def resolver_pares(indices):
+    global caminhos
+    # Pares em regiões diferentes são descartados em O(1), sem busca
+    alcancaveis = []
+    for k in indices:
+        estado = estado_pares[k]
+        estado["caminho"], estado["explorado"] = None, None
+        if componentes.conectados(estado["inicio"], estado["fim"]):
+            alcancaveis.append(k)
+
+    pares = [(estado_pares[k]["inicio"], estado_pares[k]["fim"]) for k in alcancaveis]
+    if MODO_BUSCA == "BFS":
+        for k, (caminho, pai) in zip(alcancaveis, caminhos_em_lote(pares, ocupacao, GRID_RESOLUCAO)):
+            estado_pares[k]["caminho"], estado_pares[k]["explorado"] = caminho, pai
+    else:
+        for k, (inicio, fim) in zip(alcancaveis, pares):
+            estado_pares[k]["caminho"] = menor_caminho(inicio, fim, ocupacao, modo=MODO_BUSCA)
+
+    caminhos = [(estado["caminho"], estado["cor"]) for estado in estado_pares if estado["caminho"]]
+    marcar_sujo(caminhos=True)
+
+# --- Reparo incremental depois de alternar o obstáculo `cel` ---
+# Virou obstáculo: só os caminhos que passam por `cel` deixam de valer (os outros
+# continuam mínimos, pois um obstáculo a mais nunca encurta um caminho).
+# Virou livre: só muda o resultado de uma busca que chegou a encostar em `cel`
+# (algum vizinho explorado) ou de um par que antes estava em outra região.
+def reparar_caminhos(cel):
+    R = GRID_RESOLUCAO
+    if cel in obstaculos:
+        afetados = [k for k, estado in enumerate(estado_pares)
+                    if estado["caminho"] and cel in estado["caminho"]]
+    else:
+        lin, col = cel
+        vizinhanca = [nl * R + nc for nl, nc in ((lin, col), (lin+1, col), (lin-1, col), (lin, col+1), (lin, col-1))
+                      if 0 <= nl < R and 0 <= nc < R]
+        afetados = []
+        for k, estado in enumerate(estado_pares):
+            if estado["caminho"] is None:
+                if componentes.conectados(estado["inicio"], estado["fim"]):
+                    afetados.append(k)
+            elif estado["explorado"] is None or any(estado["explorado"][v] != -1 for v in vizinhanca):
+                afetados.append(k)
+    if afetados:
+        resolver_pares(afetados)
+
+# --- Menor caminho entre dois pontos ---
+# modo="BFS": BFS com lista de predecessores; "BIDIRECIONAL": BFS a partir das
+# duas pontas; "WAVEFRONT": frente de onda vetorizada (requer NumPy).
+# O número de células visitadas fica em algoritmos.estatisticas["visitados"].
+def menor_caminho(inicio, fim, obstaculos, modo="BFS"):
+    R = GRID_RESOLUCAO
+    bloqueado = mapa_ocupacao(obstaculos, R)
+    if modo == "WAVEFRONT":
+        if np is None:
+            raise RuntimeError("O modo WAVEFRONT requer NumPy.")
+        livre = np.frombuffer(bloqueado, dtype=np.uint8).reshape(R, R) == 0
+        return menor_caminho_wavefront(inicio, fim, livre)
+    if modo == "BIDIRECIONAL":
+        return menor_caminho_bidirecional(inicio, fim, bloqueado, R)
+    return menor_caminho_bfs(inicio, fim, bloqueado, R)
 
 # --- Limpar tudo e voltar ao modo obstáculos ---
 def limpar_tudo():
@@ -147,84 +244,117 @@ def limpar_tudo():
     pontos_inicio.clear()
     pontos_fim.clear()
     obstaculos.clear()
+    ocupacao[:] = bytes(len(ocupacao))
+    componentes.recalcular()
     caminhos.clear()
+    estado_pares.clear()
     modo_atual = "OBSTACULOS"
+    marcar_sujo(estatica=True, caminhos=True)
     print("Tudo limpo. Voltando para modo Obstáculos.")
 
 # --- Gerar cenário aleatório ---
 def gerar_aleatorio():
-	
     limpar_tudo()
     DENSIDADE_OBSTACULOS = 0.20 # 20% do grid
-    
+
     # Manter n_pares = O(R) para mirar na complexidade O(R^3)
     # (Se fizesse n_pares = O(R^2), a complexidade seria O(R^4)!)
-    n_obstaculos = int((GRID_RESOLUCAO ** 2) * DENSIDADE_OBSTACULOS)
-    n_pares = GRID_RESOLUCAO # Um número O(R)
-
-    # Adicionar obstáculos aleatórios
-    while len(obstaculos) < n_obstaculos:
-        cel = (random.randint(0, GRID_RESOLUCAO-1), random.randint(0, GRID_RESOLUCAO-1))
-        obstaculos.add(cel)
-
-    # Adicionar pares de pontos aleatórios sem sobrepor obstáculos
-    while len(pontos_inicio) < n_pares:
-        lin = random.randint(0, GRID_RESOLUCAO-1)
-        col = random.randint(0, GRID_RESOLUCAO-1)
-        if (lin, col) in obstaculos or (lin, col) in pontos_inicio or (lin, col) in pontos_fim:
-            continue
-        pontos_inicio.append((lin, col))
-
-        while True:
-            lin_f = random.randint(0, GRID_RESOLUCAO-1)
-            col_f = random.randint(0, GRID_RESOLUCAO-1)
-            if (lin_f, col_f) in obstaculos or (lin_f, col_f) in pontos_inicio or (lin_f, col_f) in pontos_fim:
-                continue
-            pontos_fim.append((lin_f, col_f))
-            break
+    novos_obstaculos, novos_inicios, novos_fins = gerar_cenario(GRID_RESOLUCAO, DENSIDADE_OBSTACULOS)
+    adicionar_obstaculos(novos_obstaculos)
+    pontos_inicio.extend(novos_inicios)
+    pontos_fim.extend(novos_fins)
 
     # Gerar automaticamente os caminhos
     gerar_caminhos()
-    print(f"Cenário aleatório gerado: {n_obstaculos} obstáculos, {n_pares} pares de pontos.")
+    print(f"Cenário aleatório gerado: {len(obstaculos)} obstáculos, {len(pontos_inicio)} pares de pontos.")
 
-# --- Desenhar tudo ---
-def desenhar_tudo():
-    tela.fill(BRANCO)
+# --- Invalida camadas do desenho ---
+def marcar_sujo(estatica=False, caminhos=False):
+    global estatica_suja, caminhos_sujos, tela_suja
+    estatica_suja = estatica_suja or estatica
+    caminhos_sujos = caminhos_sujos or caminhos
+    tela_suja = True
+
+# --- Obstáculos em um único blit (grade de ocupação -> superfície) ---
+def desenhar_ocupacao(superficie, area):
+    grade = np.frombuffer(ocupacao, dtype=np.uint8).reshape(GRID_RESOLUCAO, GRID_RESOLUCAO)
+    # surfarray usa (x, y) = (col, lin), por isso a transposta
+    cores = np.where(grade.T[:, :, None] == 1, PRETO, BRANCO).astype(np.uint8)
+    camada = pygame.transform.scale(pygame.surfarray.make_surface(cores), area.size)
+    camada.set_colorkey(BRANCO) # Células livres ficam transparentes
+    superficie.blit(camada, area.topleft)
+
+# --- Camada estática: fundo, grid e obstáculos ---
+def redesenhar_camada_estatica():
+    global camada_estatica, estatica_suja
+    if camada_estatica is None:
+        camada_estatica = pygame.Surface(tela.get_size())
+    camada_estatica.fill(BRANCO)
     area = get_area_desenho()
-    desenhar_grid(tela)
+    desenhar_grid(camada_estatica)
     largura_celula = area.width / GRID_RESOLUCAO
     altura_celula = area.height / GRID_RESOLUCAO
 
-    # Obstáculos
-    for lin, col in obstaculos:
-        rect = pygame.Rect(area.left + col*largura_celula,
-                           area.top + lin*altura_celula,
-                           largura_celula, altura_celula)
-        pygame.draw.rect(tela, PRETO, rect)
+    if np is not None:
+        desenhar_ocupacao(camada_estatica, area)
+    else:
+        for lin, col in obstaculos:
+            rect = pygame.Rect(area.left + col*largura_celula,
+                               area.top + lin*altura_celula,
+                               largura_celula, altura_celula)
+            pygame.draw.rect(camada_estatica, PRETO, rect)
+    estatica_suja = False
+
+# --- Camada de caminhos e pontos (transparente) ---
+def redesenhar_camada_caminhos():
+    global camada_caminhos, caminhos_sujos
+    if camada_caminhos is None:
+        camada_caminhos = pygame.Surface(tela.get_size(), pygame.SRCALPHA)
+    camada_caminhos.fill((0, 0, 0, 0))
 
-    # Caminhos
     for caminho, cor in caminhos:
         pontos_pixel = [centro_celula(l, c) for l, c in caminho]
-        pygame.draw.lines(tela, cor, False, pontos_pixel, 4)
+        if len(pontos_pixel) > 1:
+            pygame.draw.lines(camada_caminhos, cor, False, pontos_pixel, 4)
 
-    # Pontos
     for cel in pontos_inicio:
-        pygame.draw.circle(tela, AZUL, centro_celula(*cel), 6)
+        pygame.draw.circle(camada_caminhos, AZUL, centro_celula(*cel), 6)
     for cel in pontos_fim:
-        pygame.draw.circle(tela, VERMELHO, centro_celula(*cel), 6)
+        pygame.draw.circle(camada_caminhos, VERMELHO, centro_celula(*cel), 6)
+    caminhos_sujos = False
 
-    # Instruções
-    fonte = pygame.font.Font(None, 26)
+# --- Texto de instruções (fonte e superfícies memorizadas) ---
+def texto_instrucao():
+    global fonte
     if modo_atual == "OBSTACULOS":
         instrucao_txt = 'Modo: Obstáculos | S → Pontos | C → Limpar | A → Aleatório | ESC: Sair'
     elif modo_atual == "PONTOS":
         instrucao_txt = 'Modo: Pontos | S → Caminhos | C → Limpar | A → Aleatório | ESC: Sair'
     else:
-        instrucao_txt = 'Modo: Caminhos | S → Obstáculos | C → Limpar  | A → Aleatório | ESC: Sair'
+        instrucao_txt = 'Modo: Caminhos | Clique → Obstáculo | S → Obstáculos | C → Limpar | A → Aleatório | ESC: Sair'
+
+    if instrucao_txt not in textos_renderizados:
+        if fonte is None:
+            fonte = pygame.font.Font(None, 26)
+        textos_renderizados[instrucao_txt] = fonte.render(instrucao_txt, True, PRETO)
+    return textos_renderizados[instrucao_txt]
+
+# --- Desenhar tudo ---
+# Só recompõe a tela quando alguma coisa mudou; as camadas válidas são apenas coladas.
+def desenhar_tudo():
+    global tela_suja
+    if not tela_suja:
+        return
+    if estatica_suja:
+        redesenhar_camada_estatica()
+    if caminhos_sujos:
+        redesenhar_camada_caminhos()
 
-    instrucao = fonte.render(instrucao_txt, True, PRETO)
-    tela.blit(instrucao, (20, 10))
+    tela.blit(camada_estatica, (0, 0))
+    tela.blit(camada_caminhos, (0, 0))
+    tela.blit(texto_instrucao(), (20, 10))
     pygame.display.flip()
+    tela_suja = False
 
 # --- Loop principal ---
 def main():
@@ -1,13 +1,39 @@
 from abc import ABC, abstractmethod
+from array import array
 
 # 1. Target (Interface do Cliente)
 class IGridAdapter(ABC):
     """Interface que o GridSystem espera para obter a vizinhança."""
+    def __init__(self):
+        self._tabelas = {} # resolucao -> (inicio, vizinhos)
+
     @abstractmethod
     def obter_vizinhos(self, lin, col, resolucao):
         """Retorna uma lista de coordenadas vizinhas (linha, coluna)."""
         pass
 
+    @abstractmethod
+    def distancia(self, a, b):
+        """Menor número de passos entre duas células ignorando obstáculos (heurística do A*)."""
+        pass
+
+    def tabela_vizinhos(self, resolucao):
+        """
+        Vizinhança pré-calculada no formato CSR, com as células como ids inteiros
+        (id = lin * resolucao + col): os vizinhos de id são
+        vizinhos[inicio[id]:inicio[id + 1]], na mesma ordem de obter_vizinhos.
+        Montada uma única vez por resolução.
+        """
+        if resolucao not in self._tabelas:
+            inicio = array('i', [0])
+            vizinhos = array('i')
+            for lin in range(resolucao):
+                for col in range(resolucao):
+                    vizinhos.extend(nl * resolucao + nc for nl, nc in self.obter_vizinhos(lin, col, resolucao))
+                    inicio.append(len(vizinhos))
+            self._tabelas[resolucao] = (inicio, vizinhos)
+        return self._tabelas[resolucao]
+
 # 2. Vizinhos Retangulares
 class RetangularAdapter(IGridAdapter):
     """Implementa a lógica de vizinhança para grids quadrados (4 direções)."""
@@ -20,6 +46,10 @@ class RetangularAdapter(IGridAdapter):
                 vizinhos.append((nl, nc))
         return vizinhos
 
+    def distancia(self, a, b):
+        # Distância de Manhattan
+        return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
 # 3. Vizinhos Hexagonais
 class HexagonalAdapter(IGridAdapter):
     """Implementa a lógica de vizinhança para grids hexagonais (6 direções)."""
@@ -37,4 +67,14 @@ class HexagonalAdapter(IGridAdapter):
             nl, nc = lin + dl, col + dc
             if 0 <= nl < resolucao and 0 <= nc < resolucao:
                 vizinhos.append((nl, nc))
-        return vizinhos
\ No newline at end of file
+        return vizinhos
+
+    def distancia(self, a, b):
+        # Linhas ímpares deslocadas para a direita ("odd-r"): converte para
+        # coordenadas cúbicas e a distância é a maior diferença entre os eixos
+        def cubo(lin, col):
+            x = col - (lin - (lin & 1)) // 2
+            return x, lin, -x - lin
+        xa, za, ya = cubo(*a)
+        xb, zb, yb = cubo(*b)
+        return max(abs(xa - xb), abs(ya - yb), abs(za - zb))
\ No newline at end of file
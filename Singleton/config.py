@@ -3,6 +3,8 @@ CONFIG = {
     "LARGURA_TELA": 800,
     "ALTURA_TELA": 600,
     "GRID_RESOLUCAO": 20,
+    "ALGORITMO": "BFS_SIMPLES", # "BFS_SIMPLES", "ASTAR" ou "JPS" (ver AlgoritmoFactory)
+    "CACHE_CAMINHOS": 0, # Caminhos guardados no cache LRU (0 = sem cache; ex.: 256)
     "CORES": {
         "BRANCO": (255, 255, 255),
         "PRETO": (0, 0, 0),
@@ -18,7 +18,7 @@ class GameEngine:
         
         self.modo = "OBSTACULOS"
         self.rodando = True
-        self.pathfinder = AlgoritmoFactory.get_algoritmo("BFS_SIMPLES")
+        self.pathfinder = AlgoritmoFactory.get_algoritmo(CONFIG["ALGORITMO"], CONFIG["CACHE_CAMINHOS"])
 
     def processar_eventos(self):
         for evento in pygame.event.get():
@@ -66,6 +66,9 @@ class GameEngine:
             if caminho:
                 cor = tuple(random.randint(50, 255) for _ in range(3))
                 self.grid.caminhos.append((caminho, cor))
+        if hasattr(self.pathfinder, "estatisticas"): # Só o CacheCaminhos (CACHE_CAMINHOS > 0)
+            e = self.pathfinder.estatisticas()
+            print(f"Cache de caminhos: {e['acertos']} acertos, {e['falhas']} falhas ({e['taxa_acertos']:.0%})")
 
     def desenhar(self):
         self.tela.fill(CONFIG["CORES"]["BRANCO"])